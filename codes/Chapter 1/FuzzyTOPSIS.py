@@ -5,6 +5,12 @@
 from numpy import *
 import matplotlib.pyplot as plt
 import timeit
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), os.pardir, 'Shared'))
+from FuzzyNumbers import f_array, f_add, f_mul, f_div, f_distance, \
+    scale_table, encode
 
 # Convert the linguistic variables for the criteria weights
 # or the ratings into fuzzy weights and fuzzy decision
@@ -13,95 +19,127 @@ def cal(a, b, k):
     """ a is the dictionary with the linguistic variables 
 	for the criteria weights (or the linguistic 
 	variables for the ratings), b is the matrix with 
-	the criteria weights (or the ratings), and k is 
-	the number of the decision makers. The output is 
-	the fuzzy decision matrix or the fuzzy weights 
-	of the criteria 
+	the criteria weights (or the ratings), linguistic 
+	or encoded with encode(), and k is the number of 
+	the decision makers. The output is the fuzzy 
+	decision matrix or the fuzzy weights of the 
+	criteria 
 	"""
-    f = []
-    for i in range(len(b)):
-        c = []
-        for z in range(3):
-            x = 0
-            for j in range (k):
-                x = x + a[b[i][j]][z]
-            c.append(round(x / k, 3))
-        f.append(c)
-    return asarray(f)
+    tab = scale_table(a)[1]
+    b = asarray(b)
+    if b.dtype.kind not in 'iu':
+        b = encode(a, b)
+    f = zeros((b.shape[0], 3))
+    for j in range(k):
+        f = f_add(f, take(tab, b[:, j], 0))
+    return around(f_div(f, k), 3)
 
 # Calculate the fuzzy normalized decision matrix
 def fndm(a, n, m):
     """ a is the fuzzy decision matrix, n is the number of
     criteria, and m is the number of the alternatives.
-    The output is the fuzzy normalized decision matrix 
+    The output is the (m x n x 3) fuzzy normalized
+    decision matrix 
 	"""
-    x = amax(a[:, 2:3])
-    f = zeros((n * m, 3))
-    for i in range(n * m):
-        for j in range(3):
-            f[i][j] = round(a[i][j] / x, 3)
-    return f
+    a = reshape(f_array(a), (m, n, 3))
+    return around(f_div(a, amax(a[..., 2])), 3)
 
 # Calculate the fuzzy weighted normalized decision matrix
 def weighted_fndm(a, b, n, m):
     """ a is the fuzzy normalized decision matrix, b is the
     criteria weights, n is the number of criteria, and m
     is the number of the alternatives. The output is
-    the fuzzy weighted normalized decision matrix 
+    the (m x n x 3) fuzzy weighted normalized decision
+    matrix 
 	"""
-    f = zeros((n * m, 3))
-    z = 0
-    for i in range(n * m):
-        if i % len(b) == 0:
-            z = 0
-        else:
-            z = z + 1
-        for j in range(3):
-            f[i][j] = round(a[i][j] * b[z][j], 3)
-    return f
-
-# Calculate the distance between two fuzzy triangular 
-# numbers
-def distance(a, b):
-    """ a and b are fuzzy triangular numbers. The output is
-    their distance 
-	"""
-    return sqrt(1/3 * ((a[0] - b[0])**2 + (a[1] - b[1])**2
-        + (a[2] - b[2])**2))
+    return around(f_mul(reshape(a, (m, n, 3)), b), 3)
 
 # Determine the fuzzy positive ideal solution (FPIS)
 def func_dist_fpis(a, n, m):
     """ a is the fuzzy weighted normalized decision matrix,
     n is the number of criteria, and m is the number of
-    the alternatives. The output is the ideal
-    solution of each criterion 
+    the alternatives. The output is the distance of
+    each alternative from the ideal solution 
 	"""
-    fpis = ones((3, 1))
-    dist_pis = zeros(m)
-    p = 0
-    for i in range(m):
-        for j in range(n):
-            dist_pis[i] = dist_pis[i] + distance(a[p + j],
-                fpis)
-        p = p + n
-    return dist_pis
+    return sum(f_distance(reshape(a, (m, n, 3)), ones(3)), 1)
 
 # Determine the fuzzy negative ideal solution (FNIS)
 def func_dist_fnis(a, n, m):
     """ a is the fuzzy weighted normalized decision matrix,
     n is the number of criteria, and m is the number of
-    the alternatives. The output is the anti-ideal
-    solution of each criterion 
+    the alternatives. The output is the distance of
+    each alternative from the anti-ideal solution 
 	"""
-    fnis = zeros((3, 1))
-    dist_nis = zeros(m)
-    p = 0
-    for i in range(m):
-        for j in range(n):
-            dist_nis[i] = dist_nis[i] + distance(a[p + j],
-                fnis)
-        p = p + n
-    return dist_nis
+    return sum(f_distance(reshape(a, (m, n, 3)), zeros(3)), 1)
+
+# Steps 5 to 8 of Fuzzy TOPSIS on the aggregated fuzzy
+# weights and decision matrix
+def closeness(w, a, n, m):
+    """ w is the fuzzy weights of the criteria, a is the
+    fuzzy decision matrix, n is the number of criteria,
+    and m is the number of the alternatives. The output
+    is the distances from the ideal and the anti-ideal
+    solutions and the closeness coefficients
+    """
+    fuzzy_norm_decision_matrix = fndm(a, n, m)
+
+    # Step 5
+    weighted_fuzzy_norm_decision_matrix = \
+        weighted_fndm(fuzzy_norm_decision_matrix, w, n, m)
+
+    # Steps 6 and 7
+    a_plus = func_dist_fpis(
+		weighted_fuzzy_norm_decision_matrix, n, m)
+    a_minus = func_dist_fnis(
+		weighted_fuzzy_norm_decision_matrix, n, m)
+
+    # Step 8: closeness coefficient
+    CC = around(a_minus / (a_plus + a_minus), 3)
+    return a_plus, a_minus, CC
+
+# Fuzzy TOPSIS with the opinions of the decision makers
+# added one (or one batch) at a time
+class FuzzyTopsisStream:
+    """ a is the dictionary with the linguistic variables
+    for the criteria weights, c is the dictionary with
+    the linguistic variables for the ratings, n is the
+    number of criteria, and m is the number of the
+    alternatives. Only the running sums of the fuzzy
+    numbers are kept, so the memory does not depend on
+    the number of the decision makers
+    """
+    def __init__(self, a, c, n, m):
+        self.a = a
+        self.c = c
+        self.n = n
+        self.m = m
+        self.k = 0
+        self.w = zeros((n, 3))
+        self.f = zeros((n * m, 3))
+
+    def add(self, b, d):
+        """ b is the importance weights of the criteria and
+        d is the ratings (one column per decision maker,
+        linguistic or encoded with encode()) of the new
+        decision makers
+        """
+        b = reshape(b, (self.n, -1))
+        d = reshape(d, (self.n * self.m, -1))
+        for x, y, a in ((self.w, b, self.a), (self.f, d, self.c)):
+            if y.dtype.kind not in 'iu':
+                y = encode(a, y)
+            tab = scale_table(a)[1]
+            for j in range(y.shape[1]):
+                x[...] = f_add(x, take(tab, y[:, j], 0))
+        self.k += b.shape[1]
+
+    def result(self):
+        """ the output is the closeness coefficients for the
+        decision makers added so far, the same as the
+        output of f_topsis() for all their ratings
+        """
+        return closeness(around(f_div(self.w, self.k), 3),
+            around(f_div(self.f, self.k), 3), self.n, self.m)[2]
 
 # Fuzzy TOPSIS method: it calls the other functions
 def f_topsis(a, b, c, d, n, m, k, pl):
@@ -118,25 +156,10 @@ def f_topsis(a, b, c, d, n, m, k, pl):
     # Steps 3 and 4
     fuzzy_weights = cal(a, b, k)
     fuzzy_decision_matrix = cal(c, d, k)
-    fuzzy_norm_decision_matrix = fndm(fuzzy_decision_matrix,
-        n, m)
 
-    # Step 5
-    weighted_fuzzy_norm_decision_matrix = \
-        weighted_fndm(fuzzy_norm_decision_matrix,
-        fuzzy_weights, n, m)
-
-    # Steps 6 and 7
-    a_plus = func_dist_fpis(
-		weighted_fuzzy_norm_decision_matrix, n, m)
-    a_minus = func_dist_fnis(
-		weighted_fuzzy_norm_decision_matrix, n, m)
-
-    # Step 8
-    CC = [] # closeness coefficient
-    for i in range(m):
-        CC.append(round(a_minus[i] / (a_plus[i] +
-            a_minus[i]), 3))
+    # Steps 5 to 8
+    a_plus, a_minus, CC = closeness(fuzzy_weights,
+        fuzzy_decision_matrix, n, m)
 
     if pl == 'y':
         q = [i + 1 for i in range(m)]
@@ -195,7 +218,7 @@ c5 = [['VP', 'P', 'G'], ['P', 'VP', 'MP'],
 c6 = [['F', 'G', 'G'], ['F', 'MP', 'MG'],
       ['VG', 'MG', 'F'], ['P', 'MP', 'F']]
 
-all_ratings = vstack((c1, c2, c3, c4, c5, c6))
+all_ratings = encode(r, vstack((c1, c2, c3, c4, c5, c6)))
 
 # final results
 start = timeit.default_timer()
@@ -204,3 +227,11 @@ stop = timeit.default_timer()
 print(stop - start)
 print("Closeness coefficient = ", 
 	f_topsis(cw, cdw, r, all_ratings, n, m, k, 'y'))
+
+# the same results with the decision makers added one at a
+# time
+stream = FuzzyTopsisStream(cw, r, n, m)
+for j in range(k):
+    stream.add(array(cdw)[:, j], all_ratings[:, j])
+    print("Closeness coefficient after", j + 1,
+        "decision makers = ", stream.result())
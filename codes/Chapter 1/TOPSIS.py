@@ -5,90 +5,97 @@
 from numpy import *
 import matplotlib.pyplot as plt
 import timeit
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), os.pardir, 'Shared'))
+from Ranking import best_k
 
 # Step 1: normalize the decision matrix
-def norm(x, y):
+def norm(x, y, out = None):
     """ normalization function; x is the array with the
     performances and y is the normalization method.
-    For vector input 'v' and for linear 'l'
+    For vector input 'v' and for linear 'l'. out is an
+    optional float array with the shape of x where the
+    result is written. A stack of decision matrices
+    (scenarios x alternatives x criteria) is normalized
+    matrix by matrix
 	"""
     if y == 'v':
-        k = array(cumsum(x**2, 0))
-        z = array([[round(x[i, j] / sqrt(k[x.shape[0] - 1,
-            j]), 3) for j in range(x.shape[1])]
-            for i in range(x.shape[0])])
-        return z
+        k = sqrt(einsum('...ij,...ij->...j', x, x))
     else:
-        yy = []
-        for i in range(x.shape[1]):
-            yy.append(amax(x[:, i:i + 1]))
-            k = array(yy)
-        z = array([[round(x[i, j] / k[j], 3)
-            for j in range(x.shape[1])]
-            for i in range(x.shape[0])])
-        return z
+        k = amax(x, -2)
+    z = true_divide(x, expand_dims(k, -2), out = out)
+    return around(z, 3, out = z)
 
 # Step 2: find the weighted normalized decision matrix
-def mul_w(r, t):
+def mul_w(r, t, out = None):
     """ multiplication of each evaluation by the associate
     weight; r stands for the weights matrix and t for
-    the normalized matrix resulting from norm()
+    the normalized matrix resulting from norm(). out is
+    an optional float array with the shape of t where
+    the result is written (it can be t itself). For a
+    stack of matrices r holds one row of weights per
+    matrix
 	"""
-    z = array([[round(t[i, j] * r[j], 3)
-        for j in range(t.shape[1])]
-        for i in range(t.shape[0])])
-    return z
+    z = multiply(t, expand_dims(r, -2), out = out)
+    return around(z, 3, out = z)
 
 # Step 3: calculate the ideal and anti-ideal solutions
 def zenith_nadir(x, y):
     """ zenith and nadir virtual action function; x is the
     weighted normalized decision matrix and y is the
     action used. For min/max input 'm' and for absolute
-    input enter 'a'
+    input enter 'a'. For a stack of matrices one row of
+    ideal and anti-ideal values per matrix is returned
 	"""
     if y == 'm':
-        bb = []
-        cc = []
-        for i in range(x.shape[1]):
-            bb.append(amax(x[:, i:i + 1]))
-            b = array(bb)
-            cc.append(amin(x[:, i:i + 1]))
-            c = array(cc)
-        return (b, c)
+        return (amax(x, -2), amin(x, -2))
     else:
-        b = ones(x.shape[1])
-        c = zeros(x.shape[1])
+        b = ones(x.shape[:-2] + x.shape[-1:])
+        c = zeros(x.shape[:-2] + x.shape[-1:])
         return (b, c)
 
 # Step 4: determine the distance to the ideal and anti-ideal
 # solutions
-def distance(x, y, z):
+def distance(x, y, z, out = None):
     """ calculate the distances to the ideal solution (di+)
     and the anti-ideal solution (di-); x is the result
-    of mul_w() and y, z the results of zenith_nadir()
+    of mul_w() and y, z the results of zenith_nadir().
+    out is an optional float array with the shape of x
+    that is used as work space for both distances
 	"""
-    a = array([[(x[i, j] - y[j])**2 
-		for j in range(x.shape[1])] 
-		for i in range(x.shape[0])])
-    b = array([[(x[i, j] - z[j])**2 
-		for j in range(x.shape[1])]
-        for i in range(x.shape[0])])
-    return (sqrt(sum(a, 1)), sqrt(sum(b, 1)))
+    d = subtract(x, expand_dims(y, -2), out = out)
+    a = sqrt(einsum('...ij,...ij->...i', d, d))
+    d = subtract(x, expand_dims(z, -2), out = d)
+    b = sqrt(einsum('...ij,...ij->...i', d, d))
+    return (a, b)
 
 # TOPSIS method: it calls the other functions and includes
 # step 5
-def topsis(matrix, weight, norm_m, id_sol, pl):
+def topsis(matrix, weight, norm_m, id_sol, pl, out = None,
+    top_k = None):
     """ matrix is the initial decision matrix, weight is 
 	the weights matrix, norm_m is the normalization 
 	method, id_sol is the action used, and pl is 'y' 
 	for plotting the results or any other string for 
-	not 
+	not. out is an optional pair of float arrays with 
+	the shape of matrix (e.g., zeros((2,) + matrix.shape)) 
+	that are reused as work space, so that repeated 
+	calls do not allocate new intermediate matrices. 
+	If top_k is set, only the indices and the closeness 
+	coefficients of the top_k best alternatives are 
+	returned, best first; all the intermediate matrices 
+	and closeness coefficients are still computed, so 
+	only the output is reduced (topsis_chunked() also 
+	bounds the memory that is used)
 	"""
-    z = mul_w(weight, norm(matrix, norm_m))
+    if out is None:
+        out = (empty(matrix.shape), empty(matrix.shape))
+    z = mul_w(weight, norm(matrix, norm_m, out[0]), out[0])
     s, f = zenith_nadir(z, id_sol)
-    p, n = distance(z, s, f)
-    final_s = array([n[i] / (p[i] + n[i]) 
-		for i in range(p.shape[0])])
+    p, n = distance(z, s, f, out[1])
+    final_s = n / (p + n)
     if pl == 'y':
         q = [i + 1 for i in range(matrix.shape[0])]
         plt.plot(q, p, 'p--', color = 'red', 
@@ -107,19 +114,53 @@ def topsis(matrix, weight, norm_m, id_sol, pl):
         plt.legend()
         plt.grid(True)
         plt.show()
+    if top_k is not None:
+        return best_k(final_s, top_k)
     return final_s
 
-# performances of the alternatives
-x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
-           [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+# Batched TOPSIS method: steps 1 to 5 for a stack of
+# decision matrices
+def topsis_batch(matrices, weights, norm_m, id_sol, out = None):
+    """ matrices is the (scenarios x alternatives x
+    criteria) array with the decision matrices, weights
+    is the (scenarios x criteria) array with one row of
+    weights per scenario, norm_m is the normalization
+    method, and id_sol is the action used. out is an
+    optional pair of float arrays with the shape of
+    matrices that are reused as work space. The output
+    is the (scenarios x alternatives) array with the
+    closeness coefficients
+    """
+    if out is None:
+        out = (empty(matrices.shape), empty(matrices.shape))
+    z = mul_w(weights, norm(matrices, norm_m, out[0]), out[0])
+    s, f = zenith_nadir(z, id_sol)
+    p, n = distance(z, s, f, out[1])
+    return n / (p + n)
+
+if __name__ == '__main__':
+    # performances of the alternatives
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+               [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # weights of the criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # final results
+    start = timeit.default_timer()
+    topsis(x, w, 'v', 'm', 'n')
+    stop = timeit.default_timer()
+    print("time = ", stop - start)
+    print("Closeness coefficient = ", 
+        topsis(x, w, 'v', 'm', 'y'))
 
-# weights of the criteria
-w = array([0.4, 0.3, 0.1, 0.2])
+    # the same problem in two scenarios with different
+    # weights
+    xs = array([x, x])
+    ws = array([w, [0.25, 0.25, 0.25, 0.25]])
+    print("Closeness coefficients per scenario = ",
+        topsis_batch(xs, ws, 'v', 'm'))
 
-# final results
-start = timeit.default_timer()
-topsis(x, w, 'v', 'm', 'n')
-stop = timeit.default_timer()
-print("time = ", stop - start)
-print("Closeness coefficient = ", 
-	topsis(x, w, 'v', 'm', 'y'))
\ No newline at end of file
+    # the three best alternatives
+    print("Top 3 (alternatives, closeness coefficient) = ",
+        topsis(x, w, 'v', 'm', 'n', top_k = 3))
\ No newline at end of file
@@ -0,0 +1,122 @@
+# Filename: TOPSIS_Chunked.py
+# Description: TOPSIS method for decision matrices that are
+# read from disk in chunks of rows
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+import os
+import tempfile
+import timeit
+from TOPSIS import mul_w, zenith_nadir, distance, topsis, best_k
+
+# First pass: collect the column statistics
+def col_stats(x, chunk, buf):
+    """ x is the (memory-mapped) array with the
+    performances, chunk is the number of rows read at a
+    time, and buf is a (chunk x criteria) float work
+    array. The output is the sums of squares, the
+    maxima and the minima of the columns
+    """
+    q = zeros(x.shape[1])
+    b = full(x.shape[1], -inf)
+    c = full(x.shape[1], inf)
+    for i in range(0, x.shape[0], chunk):
+        a = buf[:x.shape[0] - i]
+        a[...] = x[i:i + chunk]
+        q += einsum('ij,ij->j', a, a)
+        maximum(b, amax(a, 0), out = b)
+        minimum(c, amin(a, 0), out = c)
+    return q, b, c
+
+# Steps 1 and 2 for a chunk of rows: normalize and weight
+# the chunk with the column statistics of the first pass
+def norm_w_chunk(a, k, w, out):
+    """ a is a chunk of the performances, k is the array
+    with the normalization divisor of each criterion, w
+    is the weights array, and out is the float work
+    array where the weighted normalized chunk is written
+    """
+    z = true_divide(a, k, out = out)
+    return mul_w(w, around(z, 3, out = z), z)
+
+# Chunked TOPSIS method: it calls the other functions
+def topsis_chunked(matrix, weight, norm_m, id_sol,
+    chunk = 100000, out = None, top_k = None):
+    """ matrix is the decision matrix (an array, a
+    numpy.memmap or the name of a .npy file), weight is
+    the weights matrix, norm_m is the normalization
+    method, id_sol is the action used, chunk is the
+    number of rows held in memory at a time, and out is
+    an optional array (e.g., a memmap) where the
+    closeness coefficients are written. The output is
+    the same as the output of topsis(). If top_k is set,
+    only the best top_k alternatives of each chunk are
+    merged with the best ones found so far, and their
+    indices and closeness coefficients are returned
+    instead of the full output
+    """
+    if isinstance(matrix, str):
+        matrix = load(matrix, mmap_mode = 'r')
+    m = matrix.shape[0]
+    if top_k is not None:
+        top_i = zeros(0, dtype = int)
+        top_s = zeros(0)
+    elif out is None:
+        out = empty(m)
+    if chunk > m:
+        chunk = m
+    buf = (empty((chunk, matrix.shape[1])),
+        empty((chunk, matrix.shape[1])))
+
+    # first pass: column norms, maxima and minima
+    q, b, c = col_stats(matrix, chunk, buf[0])
+    if norm_m == 'v':
+        k = sqrt(q)
+    else:
+        k = b
+
+    # the rounded weighted normalization is monotone in
+    # each criterion, so the ideal and anti-ideal
+    # solutions are found among the weighted normalized
+    # column extremes
+    s, f = zenith_nadir(norm_w_chunk(array([b, c]), k,
+        weight, empty((2, matrix.shape[1]))), id_sol)
+
+    # second pass: distances and closeness coefficients
+    for i in range(0, m, chunk):
+        z = norm_w_chunk(matrix[i:i + chunk], k, weight,
+            buf[0][:m - i])
+        p, n = distance(z, s, f, buf[1][:m - i])
+        if top_k is None:
+            out[i:i + chunk] = n / (p + n)
+        else:
+            j, top_s = best_k(concatenate((top_s, n / (p + n))),
+                top_k)
+            top_i = concatenate((top_i, arange(i,
+                i + p.shape[0])))[j]
+    if top_k is not None:
+        return top_i, top_s
+    return out
+
+if __name__ == '__main__':
+    # performances of the alternatives
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+               [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # weights of the criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # store the decision matrix in a .npy file and read it
+    # back two rows at a time
+    fname = os.path.join(tempfile.mkdtemp(), 'x.npy')
+    save(fname, x)
+
+    # final results
+    start = timeit.default_timer()
+    cc = topsis_chunked(fname, w, 'v', 'm', chunk = 2)
+    stop = timeit.default_timer()
+    print("time = ", stop - start)
+    print("Closeness coefficient = ", cc)
+    print("In-memory TOPSIS = ", topsis(x, w, 'v', 'm', 'n'))
+    print("Top 3 (alternatives, closeness coefficient) = ",
+        topsis_chunked(fname, w, 'v', 'm', chunk = 2, top_k = 3))
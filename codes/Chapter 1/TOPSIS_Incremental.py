@@ -0,0 +1,187 @@
+# Filename: TOPSIS_Incremental.py
+# Description: TOPSIS method with insertion and deletion
+# of alternatives
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+import heapq
+import timeit
+from TOPSIS import zenith_nadir, distance
+from TOPSIS_Chunked import norm_w_chunk
+
+# Incremental TOPSIS: keeps the column statistics and the
+# weighted normalized decision matrix between changes
+class IncrementalTopsis:
+    """ weight is the weights matrix, norm_m is the
+    normalization method ('v' for vector and 'l' for
+    linear), id_sol is the action used ('m' for min/max
+    and 'a' for absolute), and capacity is the initial
+    number of rows reserved for the alternatives
+    """
+    def __init__(self, weight, norm_m, id_sol, capacity = 1024):
+        self.w = asarray(weight, dtype = float)
+        self.norm_m = norm_m
+        self.id_sol = id_sol
+        n = self.w.shape[0]
+        self.m = 0
+        self.keys = []
+        self.index = {}
+        self.x = empty((capacity, n))
+        self.z = empty((capacity, n))
+        self.k = ones(n)
+        self.q = zeros(n)
+        self.hmax = [[] for j in range(n)]
+        self.hmin = [[] for j in range(n)]
+        self.gmax = [{} for j in range(n)]
+        self.gmin = [{} for j in range(n)]
+
+    # Column maximum and minimum with lazy deletion
+    def top(self, h, g, sign):
+        """ h is the max (sign -1) or min (sign 1) heap of
+        a criterion and g counts its deleted values, which
+        are popped until the top of the heap is alive
+        """
+        while g.get(sign * h[0], 0) > 0:
+            v = sign * heapq.heappop(h)
+            g[v] = g[v] - 1
+            if g[v] == 0:
+                del g[v]
+        return sign * h[0]
+
+    # Rebuild the heaps of a criterion from the cached rows,
+    # so that the deleted values are dropped
+    def rebuild(self, j):
+        """ j is the criterion """
+        col = self.x[:self.m, j]
+        self.hmax[j] = (-col).tolist()
+        self.hmin[j] = col.tolist()
+        heapq.heapify(self.hmax[j])
+        heapq.heapify(self.hmin[j])
+        self.gmax[j] = {}
+        self.gmin[j] = {}
+
+    def extremes(self):
+        """ the output is the arrays with the maximum and
+        the minimum performance of each criterion
+        """
+        n = self.w.shape[0]
+        b = array([self.top(self.hmax[j], self.gmax[j], -1)
+            for j in range(n)])
+        c = array([self.top(self.hmin[j], self.gmin[j], 1)
+            for j in range(n)])
+        return b, c
+
+    # Insert an alternative: O(n log m)
+    def insert(self, key, row):
+        """ key is the name of the alternative and row is
+        the array with its performances
+        """
+        if key in self.index:
+            self.delete(key)
+        row = asarray(row, dtype = float)
+        if self.m == self.x.shape[0]:
+            size = (2 * self.m + 1, row.shape[0])
+            self.x = resize(self.x, size)
+            self.z = resize(self.z, size)
+        i = self.m
+        self.x[i] = row
+        norm_w_chunk(row[newaxis], self.k, self.w,
+            self.z[i:i + 1])
+        self.q += row**2
+        for j in range(row.shape[0]):
+            heapq.heappush(self.hmax[j], -row[j])
+            heapq.heappush(self.hmin[j], row[j])
+        self.keys.append(key)
+        self.index[key] = i
+        self.m = i + 1
+
+    # Delete an alternative: amortized O(n log m); the last
+    # row takes its place in the cached matrices. The
+    # sum of squares of a criterion is recomputed from the
+    # cached rows when the deleted value made up most of it,
+    # since subtracting it would cancel the remaining
+    # digits, and the heaps of a criterion are rebuilt when
+    # the deleted values outnumber the live ones
+    def delete(self, key):
+        """ key is the name of the alternative
+        """
+        i = self.index.pop(key)
+        row = self.x[i].copy()
+        self.q -= row**2
+        for j in range(row.shape[0]):
+            v = row[j]
+            self.gmax[j][v] = self.gmax[j].get(v, 0) + 1
+            self.gmin[j][v] = self.gmin[j].get(v, 0) + 1
+        last = self.m - 1
+        if i != last:
+            self.x[i] = self.x[last]
+            self.z[i] = self.z[last]
+            self.keys[i] = self.keys[last]
+            self.index[self.keys[i]] = i
+        self.keys.pop()
+        self.m = last
+        lost = row**2 > self.q
+        if lost.any():
+            a = self.x[:self.m, lost]
+            self.q[lost] = einsum('ij,ij->j', a, a)
+        for j in range(row.shape[0]):
+            if len(self.hmax[j]) > 2 * self.m or \
+                len(self.hmin[j]) > 2 * self.m:
+                self.rebuild(j)
+
+    # Steps 1 to 5 on the cached data
+    def scores(self):
+        """ the output is the list with the names of the
+        alternatives and the array with their closeness
+        coefficients, as computed by topsis()
+        """
+        if self.m == 0:
+            return [], zeros(0)
+        x = self.x[:self.m]
+        b, c = self.extremes()
+        if self.norm_m == 'v':
+            k = sqrt(self.q)
+        else:
+            k = b
+
+        # only the criteria whose divisor changed are
+        # normalized and weighted again; with vector
+        # normalization every insertion or deletion changes
+        # all the column norms, so the whole matrix is
+        # normalized again, and the saving applies to the
+        # linear normalization only
+        stale = k != self.k
+        if stale.any():
+            self.z[:self.m, stale] = norm_w_chunk(x[:, stale],
+                k[stale], self.w[stale], None)
+            self.k = k
+        z = self.z[:self.m]
+        s, f = zenith_nadir(norm_w_chunk(array([b, c]), k,
+            self.w, None), self.id_sol)
+        p, n = distance(z, s, f)
+        return list(self.keys), n / (p + n)
+
+if __name__ == '__main__':
+    # performances of the alternatives
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+               [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # weights of the criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # insert the alternatives one by one
+    t = IncrementalTopsis(w, 'v', 'm')
+    for i in range(x.shape[0]):
+        t.insert('a' + str(i + 1), x[i])
+    keys, cc = t.scores()
+    print("Closeness coefficient = ", cc)
+
+    # remove the second alternative and add a new one
+    start = timeit.default_timer()
+    t.delete('a2')
+    t.insert('a7', [10, 8, 4, 6])
+    keys, cc = t.scores()
+    stop = timeit.default_timer()
+    print("time = ", stop - start)
+    print(keys)
+    print("Closeness coefficient = ", cc)
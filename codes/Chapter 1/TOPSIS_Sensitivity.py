@@ -0,0 +1,235 @@
+# Filename: TOPSIS_Sensitivity.py
+# Description: Weight sensitivity analysis of the TOPSIS
+# method over many weight vectors
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+import timeit
+from TOPSIS import norm, mul_w, zenith_nadir, distance, topsis
+
+# Memory (in bytes) used by the work arrays of a block of
+# weight vectors
+BUDGET = 2**28
+
+# Squared distances of all alternatives for all weight
+# vectors as matrix products
+def sweep_distance(t, w, id_sol):
+    """ t is the normalized decision matrix resulting from
+    norm(), w is the (W x n) array with the weight
+    vectors, and id_sol is the action used. The output
+    is the (W x m) arrays with the squared distances to
+    the ideal and the anti-ideal solutions
+    """
+    w2 = w**2
+    if id_sol == 'm':
+        # the ideal of a criterion is w * max(t) for a
+        # non-negative weight and w * min(t) otherwise
+        hi = (t - amax(t, 0))**2
+        lo = (t - amin(t, 0))**2
+        pos = w2 * (w >= 0)
+        neg = w2 * (w < 0)
+        a = pos @ hi.T + neg @ lo.T
+        b = pos @ lo.T + neg @ hi.T
+    else:
+        # sum((w t - 1)^2) and sum((w t)^2)
+        b = w2 @ (t**2).T
+        a = maximum(b - 2 * w @ t.T + t.shape[1], 0)
+    return a, b
+
+# Rank the alternatives for each weight vector
+def sweep_ranks(s):
+    """ s is the (W x m) array with the closeness
+    coefficients. The output is the (W x m) array with
+    the rank of each alternative (1 for the best) and
+    the number of times each alternative came first
+    """
+    o = argsort(-s, 1, kind = 'stable')
+    ranks = empty(s.shape, dtype = int)
+    put_along_axis(ranks, o, arange(1, s.shape[1] + 1)[newaxis],
+        1)
+    wins = bincount(o[:, 0], minlength = s.shape[1])
+    return ranks, wins
+
+# TOPSIS for a sweep of weight vectors: the decision matrix
+# is normalized only once
+def topsis_sweep(matrix, weights, norm_m, id_sol,
+    rounded = True, block = None):
+    """ matrix is the initial decision matrix, weights is
+    the (W x n) array with one weight vector per row,
+    norm_m is the normalization method, and id_sol is the
+    action used. By default the weighted normalized
+    matrix is rounded to 3 decimals as in topsis(), so
+    the results are the same as calling topsis() for
+    each weight vector, and block weight vectors at a
+    time are evaluated by broadcasting; a block takes two
+    (block x m x n) float arrays, so if block is not
+    given it is sized to keep them within BUDGET. If
+    rounded is False, the rounding is skipped and all
+    distances come from matrix products; this is faster,
+    but the results can differ from topsis() (e.g., in
+    the number of times an alternative comes first). The
+    output is the (W x m) array with the closeness
+    coefficients, the (W x m) array with the ranks, and
+    the number of times each alternative came first
+    """
+    weights = atleast_2d(weights)
+    t = norm(matrix, norm_m)
+    if rounded:
+        if block is None:
+            block = BUDGET // (16 * t.size)
+            if block < 1:
+                block = 1
+        s = empty((weights.shape[0], matrix.shape[0]))
+        for i in range(0, weights.shape[0], block):
+            z = mul_w(weights[i:i + block], t[newaxis])
+            y, f = zenith_nadir(z, id_sol)
+            p, n = distance(z, y, f, empty_like(z))
+            s[i:i + block] = n / (p + n)
+    else:
+        p, n = sweep_distance(t, weights, id_sol)
+        p = sqrt(p)
+        n = sqrt(n)
+        s = n / (p + n)
+    ranks, wins = sweep_ranks(s)
+    return s, ranks, wins
+
+# Weights along the path of a criterion: w_j moves to t and
+# the other weights are scaled so that the sum is kept
+def weight_path(w, j):
+    """ w is the weights array and j is the criterion. The
+    output is the arrays alpha and beta with w(t) = alpha
+    + beta * t, and the upper end of the range of t
+    """
+    s = sum(w)
+    if s - w[j] > 0:
+        alpha = w * s / (s - w[j])
+        beta = -w / (s - w[j])
+    else:
+        alpha = zeros(w.shape[0])
+        beta = zeros(w.shape[0])
+    alpha[j] = 0
+    beta[j] = 1
+    return alpha, beta, s
+
+# Squared distances along the path of a criterion as
+# polynomials of degree 2 in t
+def path_distance(t, alpha, beta, id_sol):
+    """ t is the normalized decision matrix, alpha and beta
+    are the results of weight_path(), and id_sol is the
+    action used. The output is the (m x 3) coefficients
+    (highest degree first) of the squared distances to
+    the ideal and the anti-ideal solutions
+    """
+    c = array([beta**2, 2 * alpha * beta, alpha**2]).T
+    if id_sol == 'm':
+        a = ((t - amax(t, 0))**2) @ c
+        b = ((t - amin(t, 0))**2) @ c
+    else:
+        b = (t**2) @ c
+        a = b - 2 * t @ array([zeros(t.shape[1]), beta,
+            alpha]).T
+        a[:, 2] += t.shape[1]
+    return a, b
+
+# Real roots of a stack of polynomials of degree 4
+def quartic_roots(c):
+    """ c is the (m x 5) array with the coefficients of the
+    polynomials (highest degree first). The output is
+    the array with all their real roots
+    """
+    scale = amax(abs(c), 1)
+    full = abs(c[:, 0]) > 1e-12 * scale
+    r = []
+    if full.any():
+        # eigenvalues of the companion matrices
+        d = c[full] / c[full, :1]
+        comp = zeros((d.shape[0], 4, 4))
+        comp[:, 0, :] = -d[:, 1:]
+        comp[:, 1, 0] = comp[:, 2, 1] = comp[:, 3, 2] = 1
+        r.append(linalg.eigvals(comp).ravel())
+    for i in nonzero(~full & (scale > 0))[0]:
+        r.append(roots(trim_zeros(where(abs(c[i]) > 1e-12
+            * scale[i], c[i], 0), 'f')).astype(complex))
+    if not r:
+        return zeros(0)
+    r = concatenate(r)
+    return real(r[abs(imag(r)) < 1e-9])
+
+# Weight stability intervals of the top-ranked alternative
+def topsis_stability(matrix, weight, norm_m, id_sol):
+    """ matrix is the initial decision matrix, weight is the
+    weights matrix, norm_m is the normalization method,
+    and id_sol is the action used. For each criterion,
+    its weight is moved while the other weights are
+    rescaled to keep their sum, and the interval in which
+    the best alternative stays first is found from the
+    roots of N_top * P_a - N_a * P_top, where P and N are
+    the squared distances to the ideal and anti-ideal
+    solutions (the weighted matrix is not rounded). The
+    output is the index of the best alternative and the
+    (n x 2) array with the lower and upper weight limits
+    """
+    weight = asarray(weight, dtype = float)
+    t = norm(matrix, norm_m)
+    p, n = sweep_distance(t, weight[newaxis], id_sol)
+    top = argmax(sqrt(n[0]) / (sqrt(p[0]) + sqrt(n[0])))
+    limits = zeros((weight.shape[0], 2))
+    for j in range(weight.shape[0]):
+        alpha, beta, s = weight_path(weight, j)
+        p, n = path_distance(t, alpha, beta, id_sol)
+        f = array([polysub(polymul(n[top], p[i]),
+            polymul(n[i], p[top])) for i in
+            range(matrix.shape[0]) if i != top])
+        limits[j] = (0, s)
+        if f.shape[0] == 0:
+            continue
+        r = quartic_roots(f)
+        r = sort(r[(r > 0) & (r < s)])
+
+        # keep the first root on each side where another
+        # alternative takes the first place
+        def changes(x):
+            q, z = sweep_distance(t, (alpha + beta * x)[newaxis],
+                id_sol)
+            cc = sqrt(z[0]) / (sqrt(q[0]) + sqrt(z[0]))
+            return cc[top] < amax(cc)
+        eps = 1e-9 * s
+        for x in r[r > weight[j]]:
+            if changes(x + eps):
+                limits[j, 1] = x
+                break
+        for x in r[r < weight[j]][::-1]:
+            if changes(x - eps):
+                limits[j, 0] = x
+                break
+    return top, limits
+
+if __name__ == '__main__':
+    # performances of the alternatives
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+               [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # 10000 random weight vectors
+    random.seed(1)
+    ws = random.dirichlet(ones(x.shape[1]), 10000)
+
+    # final results
+    start = timeit.default_timer()
+    s, ranks, wins = topsis_sweep(x, ws, 'v', 'm')
+    stop = timeit.default_timer()
+    print("time = ", stop - start)
+    print("Times ranked first = ", wins)
+    print("Same as topsis() for the first weight vector: ",
+        allclose(s[0], topsis(x, ws[0], 'v', 'm', 'n')))
+
+    start = timeit.default_timer()
+    s, ranks, wins = topsis_sweep(x, ws, 'v', 'm', rounded = False)
+    stop = timeit.default_timer()
+    print("time (not rounded) = ", stop - start)
+    print("Times ranked first = ", wins)
+
+    # weight stability intervals for the book weights
+    w = array([0.4, 0.3, 0.1, 0.2])
+    top, limits = topsis_stability(x, w, 'v', 'm')
+    print("Best alternative = ", top + 1)
+    print("Weight stability intervals = ", limits)
@@ -5,6 +5,13 @@
 from numpy import *
 import matplotlib.pyplot as plt
 import timeit
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), os.pardir, 'Shared'))
+from FuzzyNumbers import f_array, f_sub, f_mul, f_defuzz, \
+    scale_table, encode
+from VIKOR import best_worst_fij, SR, Q
 
 # Step 4: Convert the linguistic variables for the criteria
 # weights or the ratings into fuzzy weights and fuzzy 
@@ -13,96 +20,134 @@ def agg_fuzzy_value(a, b, k):
     """ a is the dictionary with the linguistic variables 
 	for the criteria weights (or the linguistic 
 	variables for the ratings), b is the matrix with 
-	the criteria weights (or the ratings), and k is 
-	the number of the decision makers. The output 
-	is the fuzzy decision matrix or the fuzzy 
-	weights of the criteria 
+	the criteria weights (or the ratings), linguistic 
+	or encoded with encode(), and k is the number of 
+	the decision makers. The output is the fuzzy 
+	decision matrix or the fuzzy weights of the 
+	criteria 
 	"""
-    f = zeros((len(b), 4))
-    for j in range(len(b)):
-        k0 = a[b[j][0]][0]
-        k1 = 0
-        k2 = 0
-        k3 = a[b[j][0]][3]
-        for i in range (len(b[1])):
-            if k0 > a[b[j][i]][0]:
-                k0 = a[b[j][i]][0]
-            k1 = k1 + a[b[j][i]][1]
-            k2 = k2 + a[b[j][i]][2]
-            if k3 < a[b[j][i]][3]:
-                k3 = a[b[j][i]][3]
-        f[j][0] = round(k0, 3)
-        f[j][1] = round(k1 / k, 3)
-        f[j][2] = round(k2 / k, 3)
-        f[j][3] = round(k3, 3)
-    return f
-
-# Step 5: Deffuzify a trapezoidal fuzzy number into
-# a crisp value
-def defuzz(a):
-    """ a is a trapezoidal matrix. The output is a
-	crisp value 
-	"""
-    return (-a[0] * a[1] + a[2] * a[3] +
-        1 / 3 * (a[3] - a[2])**2 -
-        1 / 3 * (a[1] - a[0])**2) \
-        / (-a[0] - a[1] + a[2] + a[3])
-
-# Step 6: Determine the best and worst values for all
-# criteria functions
-def best_worst_fij(a, b):
-    """ a is the array with the performances and b is
-	the criteria min/max array 
-	"""
-    f = zeros((b.shape[0], 2))
-    for i in range(b.shape[0]):
-        if b[i] == 'max':
-            f[i, 0] = a.max(0)[i]
-            f[i, 1] = a.min(0)[i]
-        elif b[i] == 'min':
-            f[i, 0] = a.min(0)[i]
-            f[i, 1] = a.max(0)[i]
-    return f
-
-# Step 7: Compute the values S_i and R_i
-def SR(a, b, c):
-    """ a is the array with the performances, b is the
-	array with the best and worst performances, and c
-	is the criteria min/max array 
-	"""
-    s = zeros(a.shape[0])
-    r = zeros(a.shape[0])
-    for i in range(a.shape[0]):
-        k = 0
-        o = 0
-        for j in range(a.shape[1]):
-            k = k + c[j] * (b[j, 0] - a[i, j]) \
-                    / (b[j, 0] - b[j, 1])
-            u = c[j] * (b[j, 0] - a[i, j]) \
-                / (b[j, 0] - b[j, 1])
-            if u > o:
-                o = u
-                r[i] = round(o, 3)
-            else:
-                r[i] = round(o, 3)
-        s[i] = round(k, 3)
-    return s, r
-
-# Step 8: compute the values Q_i
-def Q(s, r, n):
-    """ s is the vector with the S_i values, r is
-	the vector with the R_i values, and n is the
-	number of criteria 
-	"""
-    q = zeros(s.shape[0])
-    for i in range(s.shape[0]):
-        q[i] = round((((n + 1) / (2 * n)) *
-            (s[i] - min(s)) / (max(s) - min(s)) +
-            (1 - (n + 1) / (2 * n)) *
-            (r[i] - min(r)) / (max(r) - min(r))), 3)
-    return q
-
-def f_vikor(a, b, c, d, e, n, m, k, pl):
+    tab = scale_table(a)[1]
+    b = asarray(b)
+    if b.dtype.kind not in 'iu':
+        b = encode(a, b)
+    f = take(tab, b[:, 0], 0)
+    for i in range(1, b.shape[1]):
+        t = take(tab, b[:, i], 0)
+        minimum(f[:, 0], t[:, 0], out = f[:, 0])
+        f[:, 1:3] += t[:, 1:3]
+        maximum(f[:, 3], t[:, 3], out = f[:, 3])
+    f[:, 1:3] /= k
+    return around(f, 3)
+
+# Step 7 with fuzzy numbers: compute the trapezoidal
+# values S_i and R_i
+def fuzzy_SR(a, e, w):
+    """ a is the (m x n x 4) array with the fuzzy ratings,
+    e is the criteria max_min array, and w is the
+    (n x 4) array with the fuzzy weights. The output is
+    the (m x 4) arrays with the fuzzy S_i and R_i
+    """
+    hi = a.max(0)
+    lo = a.min(0)
+    best = where((e == 'max')[:, newaxis], hi, lo)
+    worst = where((e == 'max')[:, newaxis], lo, hi)
+
+    # normalized fuzzy difference from the best value
+    up = e == 'max'
+    g = where(up[:, newaxis], f_sub(best, a), f_sub(a, best))
+    den = where(up, best[:, 3] - worst[:, 0],
+        worst[:, 3] - best[:, 0])
+    d = f_mul(g / den[:, newaxis], w)
+    return d.sum(1), d.max(1)
+
+# Steps 5 to 8 of Fuzzy VIKOR on the aggregated fuzzy
+# weights and ratings
+def crisp_SRQ(w, f, e, n, m, fuzzy = False):
+    """ w is the fuzzy weights of the criteria, f is the
+    fuzzy ratings, e is the criteria max_min array, n is
+    the number of criteria, m is the number of the
+    alternatives, and fuzzy is True for computing S and
+    R with the fuzzy numbers and defuzzifying only them.
+    The output is the S, R and Q values
+    """
+    if fuzzy:
+        # the ratings are listed criterion by criterion
+        a = f_array(f).reshape(n, m, 4).transpose(1, 0, 2)
+        s, r = fuzzy_SR(a, e, f_array(w))
+        s = around(f_defuzz(s), 3)
+        r = around(f_defuzz(r), 3)
+        return s, r, Q(s, r, n)
+
+    # Step 5: defuzzify the weights and the ratings (the
+    # ratings are listed criterion by criterion)
+    crisp_weights = around(f_defuzz(f_array(w)), 3)
+    crisp_alternative_ratings = around(f_defuzz(
+        f_array(f)), 3).reshape(n, m).T
+    s, r = SR(crisp_alternative_ratings,
+        best_worst_fij(crisp_alternative_ratings, e),
+        crisp_weights)
+    q = Q(s, r, len(w))
+    return s, r, q
+
+# Fuzzy VIKOR with the opinions of the decision makers
+# added one (or one batch) at a time
+class FuzzyVikorStream:
+    """ a is the dictionary with the linguistic variables
+    for the criteria weights, c is the dictionary with
+    the linguistic variables for the ratings, e is the
+    criteria max_min array, n is the number of criteria,
+    and m is the number of the alternatives. Only the
+    running minimum, sums and maximum of the trapezoidal
+    numbers are kept, so the memory does not depend on
+    the number of the decision makers
+    """
+    def __init__(self, a, c, e, n, m):
+        self.a = a
+        self.c = c
+        self.e = e
+        self.n = n
+        self.m = m
+        self.k = 0
+        self.w = array([[inf, 0, 0, -inf]] * n)
+        self.f = array([[inf, 0, 0, -inf]] * (n * m))
+
+    def add(self, b, d):
+        """ b is the importance weights of the criteria and
+        d is the ratings (one column per decision maker,
+        linguistic or encoded with encode()) of the new
+        decision makers
+        """
+        b = reshape(b, (self.n, -1))
+        d = reshape(d, (self.n * self.m, -1))
+        for x, y, a in ((self.w, b, self.a), (self.f, d, self.c)):
+            if y.dtype.kind not in 'iu':
+                y = encode(a, y)
+            tab = scale_table(a)[1]
+            for j in range(y.shape[1]):
+                t = take(tab, y[:, j], 0)
+                minimum(x[:, 0], t[:, 0], out = x[:, 0])
+                x[:, 1:3] += t[:, 1:3]
+                maximum(x[:, 3], t[:, 3], out = x[:, 3])
+        self.k += b.shape[1]
+
+    def aggregate(self, x):
+        """ x is the running minimum, sums and maximum. The
+        output is the same as the output of
+        agg_fuzzy_value()
+        """
+        f = x.copy()
+        f[:, 1:3] /= self.k
+        return around(f, 3)
+
+    def result(self):
+        """ the output is the S, R and Q values for the
+        decision makers added so far, the same as the
+        output of f_vikor() for all their ratings
+        """
+        return crisp_SRQ(self.aggregate(self.w),
+            self.aggregate(self.f), self.e, self.n, self.m)
+
+def f_vikor(a, b, c, d, e, n, m, k, pl, fuzzy = False):
     """ a is the dictionary with the linguistic variables
     for the criteria weights, b is the matrix with the
     importance weights of the criteria, c is a 
@@ -110,26 +155,14 @@ def f_vikor(a, b, c, d, e, n, m, k, pl):
 	ratings, d is the matrix with all the ratings, e 
 	is the criteria max_min array, n is the number 
 	of criteria, m is the number of the alternatives, 
-	k is the number of the decision makers, and pl 
-	is 'y' for plotting the results 
+	k is the number of the decision makers, pl is 
+	'y' for plotting the results, and fuzzy is True 
+	for defuzzifying only S and R 
 	"""
 
     w = agg_fuzzy_value(a, b, k)
     f_rdm_all = agg_fuzzy_value(c, d, k)
-    crisp_weights = zeros(n)
-    for i in range(n):
-        crisp_weights[i] = round(defuzz(w[i]), 3)
-    crisp_alternative_ratings = zeros((m, n))
-    k = 0
-    for i in range(n):
-        for j in range(m):
-            crisp_alternative_ratings[j][i] = \
-                round(defuzz(f_rdm_all[k]), 3)
-            k = k + 1
-    s, r = SR(crisp_alternative_ratings,
-        best_worst_fij(crisp_alternative_ratings, e),
-        crisp_weights)
-    q = Q(s, r, len(w))
+    s, r, q = crisp_SRQ(w, f_rdm_all, e, n, m, fuzzy)
     if pl == 'y':
         h = [i + 1 for i in range(m)]
         plt.plot(h, s, 'p--', color = 'red',
@@ -187,11 +220,25 @@ c5 = [['VP', 'P', 'G'], ['P', 'VP', 'MP'],
 c6 = [['F', 'G', 'G'], ['F', 'MP', 'MG'], 
 	['VG', 'MG', 'F'], ['P', 'MP', 'F']]
 
-all_ratings = vstack((c1, c2, c3, c4, c5, c6))
+all_ratings = encode(r, vstack((c1, c2, c3, c4, c5, c6)))
 
 # criteria max/min array
 crit_max_min = array(['max', 'max', 'max', 'max'])
 
+# results with the decision makers added one at a time
+stream = FuzzyVikorStream(cw, r, crit_max_min, n, m)
+for j in range(k):
+    stream.add(array(cdw)[:, j], all_ratings[:, j])
+    print("Q after", j + 1, "decision makers = ",
+        stream.result()[2])
+
+# S and R with the fuzzy numbers, defuzzified at the end
+fs, fr, fq = f_vikor(cw, cdw, r, all_ratings, crit_max_min,
+	n, m, k, 'n', True)
+print("Fuzzy S and R: S = ", fs)
+print("Fuzzy S and R: R = ", fr)
+print("Fuzzy S and R: Q = ", fq)
+
 # final results
 start = timeit.default_timer()
 f_vikor(cw, cdw, r, all_ratings, crit_max_min, n, m, 
@@ -5,6 +5,11 @@
 from numpy import *
 import matplotlib.pyplot as plt
 import timeit
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), os.pardir, 'Shared'))
+from Ranking import best_k
 
 # Step 1: determine the best and worst values for all
 # criteria functions
@@ -12,39 +17,37 @@ def best_worst_fij(a, b):
     """ a is the array with the performances and b is
 	the criteria min/max array 
 	"""
+    hi = a.max(0)
+    lo = a.min(0)
     f = zeros((b.shape[0], 2))
-    for i in range(b.shape[0]):
-        if b[i] == 'max':
-            f[i, 0] = a.max(0)[i]
-            f[i, 1] = a.min(0)[i]
-        elif b[i] == 'min':
-            f[i, 0] = a.min(0)[i]
-            f[i, 1] = a.max(0)[i]
+    f[:, 0] = where(b == 'max', hi, where(b == 'min', lo, 0))
+    f[:, 1] = where(b == 'max', lo, where(b == 'min', hi, 0))
     return f
 
 # Step 2: compute the values S_i and R_i
-def SR(a, b, c):
+def SR(a, b, c, block = 4096):
     """ a is the array with the performances, b is the
-	array with the best and worst performances, and 
-	c is the criteria min/max array 
+	array with the best and worst performances, c is 
+	the criteria min/max array, and block is the number 
+	of alternatives evaluated at a time 
 	"""
-    s = zeros(a.shape[0])
-    r = zeros(a.shape[0])
-    for i in range(a.shape[0]):
-        k = 0
-        o = 0
-        for j in range(a.shape[1]):
-            k = k + c[j] * (b[j, 0] - a[i, j]) \
-                    / (b[j, 0] - b[j, 1])
-            u = c[j] * (b[j, 0] - a[i, j]) \
-                / (b[j, 0] - b[j, 1])
-            if u > o:
-                o = u
-                r[i] = round(o, 3)
-            else:
-                r[i] = round(o, 3)
-        s[i] = round(k, 3)
-    return s, r
+    m = a.shape[0]
+    s = empty(m)
+    r = empty(m)
+    w = asarray(c)[:, newaxis]
+    d = (b[:, 0] - b[:, 1])[:, newaxis]
+
+    # one row per criterion, so that the sum over the
+    # criteria adds them in order
+    u = empty((a.shape[1], block))
+    for i in range(0, m, block):
+        v = u[:, :m - i]
+        subtract(b[:, :1], a[i:i + block].T, out = v)
+        multiply(w, v, out = v)
+        divide(v, d, out = v)
+        v.sum(0, out = s[i:i + block])
+        fmax.reduce(v, 0, out = r[i:i + block])
+    return around(s, 3), around(fmax(r, 0), 3)
 
 # Step 3: compute the values Q_i
 def Q(s, r, n):
@@ -52,20 +55,80 @@ def Q(s, r, n):
 	the vector with the R_i values, and n is the
 	number of criteria 
 	"""
-    q = zeros(s.shape[0])
-    for i in range(s.shape[0]):
-        q[i] = round((((n + 1) / (2 * n)) *
-            (s[i] - min(s)) / (max(s) - min(s)) +
-            (1 - (n + 1) / (2 * n)) *
-            (r[i] - min(r)) / (max(r) - min(r))), 3)
-    return q
+    return around((((n + 1) / (2 * n)) *
+        (s - s.min()) / (s.max() - s.min()) +
+        (1 - (n + 1) / (2 * n)) *
+        (r - r.min()) / (r.max() - r.min())), 3)
+
+# Step 3 for a grid of values of v
+def Q_sweep(s, r, v):
+    """ s is the vector with the S_i values, r is the
+    vector with the R_i values, and v is the weight of
+    the strategy of the majority of criteria or an array
+    of them. The output is the (len(v) x m) array with
+    the Q_i values for each v (the same as Q() for
+    v = (n + 1) / (2 * n))
+    """
+    v = atleast_1d(asarray(v, dtype = float))[:, newaxis]
+    return around((v * (s - s.min()) / (s.max() - s.min()) +
+        (1 - v) * (r - r.min()) / (r.max() - r.min())), 3)
+
+# Step 4: propose the compromise solution
+def compromise(s, r, q):
+    """ s is the vector with the S_i values, r is the
+    vector with the R_i values, and q is the array with
+    the Q_i values (one row per value of v). The output
+    is the boolean array with the compromise set of each
+    row of q, and the arrays with the results of the
+    acceptable advantage (C1) and acceptable stability
+    (C2) conditions
+    """
+    q = atleast_2d(q)
+    m = q.shape[1]
+
+    # a single alternative is the compromise solution
+    if m == 1:
+        ok = ones(q.shape[0], dtype = bool)
+        return ones(q.shape, dtype = bool), ok, ok.copy()
+    o = argsort(q, 1, kind = 'stable')
+    qs = take_along_axis(q, o, 1)
+    dq = 1 / (m - 1)
+    best = o[:, 0]
+    c1 = qs[:, 1] - qs[:, 0] >= dq
+    c2 = (s[best] == s.min()) | (r[best] == r.min())
+
+    # C1 does not hold: all the alternatives with
+    # Q_i - Q_best < DQ
+    comp = ~c1[:, newaxis] & (q - qs[:, :1] < dq)
+    comp[arange(q.shape[0]), best] = True
+
+    # only C2 does not hold: the best two alternatives
+    k = c1 & ~c2
+    comp[nonzero(k)[0], o[k, 1]] = True
+    return comp, c1, c2
+
+# VIKOR compromise solutions for a grid of values of v
+def vikor_compromise(a, b, c, v):
+    """ a is the decision matrix, b is the criteria
+    min/max array, c is the weights matrix, and v is the
+    array with the weights of the strategy of the
+    majority of criteria. The output is the S and R
+    values, the (len(v) x m) array with the Q values,
+    and the (len(v) x m) boolean array with the
+    compromise set for each v
+    """
+    s, r = SR(a, best_worst_fij(a, b), c)
+    q = Q_sweep(s, r, v)
+    return s, r, q, compromise(s, r, q)[0]
 
 # VIKOR method: it calls the other functions
-def vikor(a, b, c, pl):
+def vikor(a, b, c, pl, top_k = None):
     """ a is the decision matrix, b is the criteria
 	min/max array, c is the weights matrix, and pl 
 	is 'y' for plotting the results or any other 
-	string for not 
+	string for not. If top_k is set, only the indices 
+	and the S, R and Q values of the top_k alternatives 
+	with the lowest Q are returned, best first 
 	"""
     s, r = SR(a, best_worst_fij(a, b), c)
     q = Q(s, r, len(c))
@@ -86,24 +149,37 @@ def vikor(a, b, c, pl):
         plt.legend()
         plt.grid(True)
         plt.show()
+    if top_k is not None:
+        i, q = best_k(q, top_k, largest = False)
+        return i, s[i], r[i], q
     return s, r, q
 
-# performances of the alternatives
-x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
-    [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
-
-# weights of the criteria
-w = array([0.4, 0.3, 0.1, 0.2])
-
-# criteria max/min
-crit_max_min = array(['max', 'max', 'max', 'max'])
-
-# final results
-start = timeit.default_timer()
-vikor(x, crit_max_min, w, 'n')
-stop = timeit.default_timer()
-print(stop - start)
-s, r, q = vikor(x, crit_max_min, w, 'y')
-print("S = ", s)
-print("R = ", r)
-print("Q = ", q)
+if __name__ == '__main__':
+    # performances of the alternatives
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+        [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # weights of the criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # criteria max/min
+    crit_max_min = array(['max', 'max', 'max', 'max'])
+
+    # final results
+    start = timeit.default_timer()
+    vikor(x, crit_max_min, w, 'n')
+    stop = timeit.default_timer()
+    print(stop - start)
+    s, r, q = vikor(x, crit_max_min, w, 'y')
+    print("S = ", s)
+    print("R = ", r)
+    print("Q = ", q)
+    print("Top 3 (alternatives, S, R, Q) = ",
+        vikor(x, crit_max_min, w, 'n', top_k = 3))
+
+    # compromise solutions for v = 0, 0.25, ..., 1
+    v = linspace(0, 1, 5)
+    s, r, q, comp = vikor_compromise(x, crit_max_min, w, v)
+    for i in range(v.shape[0]):
+        print("v = ", v[i], " compromise set = ",
+            nonzero(comp[i])[0] + 1)
@@ -0,0 +1,283 @@
+# Filename: VIKOR_Sensitivity.py
+# Description: Weight stability intervals of the VIKOR
+# method
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+from VIKOR import best_worst_fij, vikor
+
+# Normalized distances of the performances from the best
+# values
+def regret(a, f):
+    """ a is the array with the performances and f is the
+    array with the best and worst performances. The
+    output is the (m x n) array with the terms of S_i
+    and R_i before the weighting
+    """
+    return (f[:, 0] - a) / (f[:, 0] - f[:, 1])
+
+# S and R along the path of a criterion: w_j moves to t and
+# the other weights are scaled so that the sum is kept
+def path_SR(d, w, j, t):
+    """ d is the result of regret(), w is the weights
+    array, j is the criterion, and t is the array with
+    the values of w_j. The output is the (len(t) x m)
+    arrays with S and R
+    """
+    total = sum(w)
+    if total > w[j]:
+        g = (total - t) / (total - w[j])
+    else:
+        g = zeros(t.shape[0])
+    e = delete(d, j, 1) * delete(w, j)
+    s = outer(g, sum(e, 1)) + outer(t, d[:, j])
+    r = maximum(maximum(outer(g, amax(e, 1, initial = 0)),
+        outer(t, d[:, j])), 0)
+    return s, r
+
+# S, R and Q along the path of a criterion
+def path_SRQ(d, w, j, t, v):
+    """ d, w, j and t are as in path_SR(), and v is the
+    weight of the strategy of the majority of criteria.
+    The output is the (len(t) x m) arrays with S, R and Q
+    """
+    s, r = path_SR(d, w, j, t)
+    q = v * (s - amin(s, 1, keepdims = True)) \
+        / ptp(s, 1, keepdims = True) \
+        + (1 - v) * (r - amin(r, 1, keepdims = True)) \
+        / ptp(r, 1, keepdims = True)
+    return s, r, q
+
+# Value of w_j where R_i changes from one criterion to
+# another, for each alternative
+def regret_kinks(d, w, j):
+    """ d is the result of regret(), w is the weights
+    array, and j is the criterion. The output is the
+    array with the value of w_j where the maximum
+    weighted regret of each alternative switches between
+    criterion j and the other criteria (nan if it does
+    not switch inside (0, sum(w)))
+    """
+    total = sum(w)
+    c = amax(delete(d, j, 1) * delete(w, j), 1, initial = 0)
+    den = d[:, j] * (total - w[j]) + c
+    k = full(d.shape[0], nan)
+    k[den > 0] = total * c[den > 0] / den[den > 0]
+    k[~((k > 0) & (k < total))] = nan
+    return k
+
+# Breakpoints of the upper envelope of lines
+def line_kinks(a, b):
+    """ a and b are the arrays with the intercepts and the
+    slopes of the lines. The lines are sorted by slope
+    and kept on a stack while they form the upper convex
+    hull. The output is the array with the values where
+    max(a + b * t) changes from one line to another
+    """
+    o = lexsort((a, b))
+    hull = []
+    for i in o:
+        if len(hull) > 0 and b[hull[-1]] == b[i]:
+            hull.pop()
+        while len(hull) > 1:
+            k, l = hull[-2], hull[-1]
+
+            # l is not needed if i meets k before l does
+            if (a[k] - a[i]) * (b[l] - b[k]) <= \
+                (a[k] - a[l]) * (b[i] - b[k]):
+                hull.pop()
+            else:
+                break
+        hull.append(i)
+    hull = array(hull, dtype = int)
+    return (a[hull[:-1]] - a[hull[1:]]) \
+        / (b[hull[1:]] - b[hull[:-1]])
+
+# Minimum of two piecewise linear functions
+def merge_min(f, g):
+    """ f and g are the pairs (t, y) with the breakpoints
+    and the values of two piecewise linear functions on
+    the same interval. The output is the pair (t, y) of
+    their minimum, with the crossings added to the
+    breakpoints
+    """
+    t = union1d(f[0], g[0])
+    y1 = interp(t, f[0], f[1])
+    y2 = interp(t, g[0], g[1])
+    e = y1 - y2
+    k = nonzero(e[:-1] * e[1:] < 0)[0]
+    tc = t[k] + (t[k + 1] - t[k]) * e[k] / (e[k] - e[k + 1])
+    yc = y1[k] + (y1[k + 1] - y1[k]) * (tc - t[k]) \
+        / (t[k + 1] - t[k])
+    o = argsort(concatenate((t, tc)), kind = 'stable')
+    return concatenate((t, tc))[o], \
+        concatenate((minimum(y1, y2), yc))[o]
+
+# Breakpoints of the lower envelope of piecewise linear
+# functions
+def envelope_kinks(f):
+    """ f is the list of the pairs (t, y) with the
+    breakpoints and the values of piecewise linear
+    functions on the same interval. The minimum is found
+    by merging the functions in pairs. The output is the
+    array with its breakpoints
+    """
+    while len(f) > 1:
+        g = [merge_min(f[k], f[k + 1])
+            for k in range(0, len(f) - 1, 2)]
+        if len(f) % 2 == 1:
+            g.append(f[-1])
+        f = g
+    return f[0][0]
+
+# Breakpoints of S, R and their minimum and maximum along
+# the path of a criterion
+def path_breaks(d, w, j):
+    """ d is the result of regret(), w is the weights
+    array, and j is the criterion. Between two
+    consecutive breakpoints, S_i, R_i, min(S), max(S),
+    min(R) and max(R) are all linear in w_j. The output
+    is the sorted array with the breakpoints
+    """
+    total = sum(w)
+    ends = array([0, total])
+    s, r = path_SR(d, w, j, ends)
+    k = regret_kinks(d, w, j)
+    t = [array([0, w[j], total]), k[~isnan(k)]]
+
+    # S_i are lines, and R_i is the maximum of the line of
+    # criterion j and the line of the other criteria
+    a = s[0]
+    b = (s[1] - s[0]) / total
+    t.append(line_kinks(a, b))
+    t.append(line_kinks(-a, -b))
+    g = amax(delete(d, j, 1) * delete(w, j), 1, initial = 0)
+    g = g * (total / (total - w[j]) if total > w[j] else 0)
+    t.append(line_kinks(concatenate((g, zeros(d.shape[0]))),
+        concatenate((-g / total, d[:, j]))))
+    rk = path_SR(d, w, j, nan_to_num(k))[1]
+    f = []
+    for i in range(d.shape[0]):
+        if isnan(k[i]):
+            f.append((ends, r[:, i]))
+        else:
+            f.append((array([0, k[i], total]),
+                array([r[0, i], rk[i, i], r[1, i]])))
+    t.append(envelope_kinks(f))
+    t = concatenate(t)
+    return unique(t[(t >= 0) & (t <= total)])
+
+# First point of each piece where an alternative gets a
+# lower Q than the top-ranked one
+def first_crossing(s, r, top, v):
+    """ s and r are the ((k + 1) x m) arrays with S and R
+    at the ends of k consecutive pieces, top is the
+    top-ranked alternative, and v is the weight of the
+    strategy of the majority of criteria. On a piece, the
+    sign of Q_i - Q_top is the sign of a quadratic in the
+    position x in [0, 1] along the piece. The output is
+    the array with the smallest x of each piece where
+    Q_i < Q_top for some i (nan if there is none)
+    """
+    ds = s - s[:, top:top + 1]
+    dr = r - r[:, top:top + 1]
+    D1 = ptp(s, 1)
+    D2 = ptp(r, 1)
+    a0 = ds[:-1]; a1 = ds[1:] - ds[:-1]
+    c0 = dr[:-1]; c1 = dr[1:] - dr[:-1]
+
+    # a term with a constant zero range has no effect
+    z1 = (D1[:-1] == 0) & (D1[1:] == 0)
+    z2 = (D2[:-1] == 0) & (D2[1:] == 0)
+    e0 = where(z1, 1, D1[:-1])[:, newaxis]
+    e1 = where(z1, 0, D1[1:] - D1[:-1])[:, newaxis]
+    b0 = where(z2, 1, D2[:-1])[:, newaxis]
+    b1 = where(z2, 0, D2[1:] - D2[:-1])[:, newaxis]
+    A = v * a1 * b1 + (1 - v) * c1 * e1
+    B = v * (a0 * b1 + a1 * b0) + (1 - v) * (c0 * e1 + c1 * e0)
+    C = v * a0 * b0 + (1 - v) * c0 * e0
+
+    # N = A * x**2 + B * x + C is not negative at the
+    # start; its minimum on [0, 1] is at the vertex if
+    # A > 0 and at an end otherwise
+    tol = 1e-12 * (abs(A) + abs(B) + abs(C))
+    x = where(A + B + C < C, 1.0, 0.0)
+    k = A > 0
+    x[k] = clip(-B[k] / (2 * A[k]), 0, 1)
+    hit = A * x**2 + B * x + C < -tol
+
+    # the crossing is the smaller root if A > 0, the larger
+    # one if A < 0, and -C / B if N is linear
+    A = A[hit]; B = B[hit]; C = C[hit]
+    h = -0.5 * (B + copysign(sqrt(maximum(B**2 - 4 * A * C,
+        0)), B))
+    r1 = where(A != 0, h / where(A != 0, A, 1), inf)
+    r2 = where(h != 0, C / where(h != 0, h, 1), 0)
+    x = full(hit.shape, inf)
+    x[hit] = where(A > 0, minimum(r1, r2), where(A < 0,
+        maximum(r1, r2), -C / where(B != 0, B, -1)))
+    x[hit] = clip(where(C < 0, 0, x[hit]), 0, 1)
+    x = amin(x, 1)
+    return where(isinf(x), nan, x)
+
+# Weight stability intervals of the top-ranked alternative
+def vikor_stability(a, b, c, v = None, block = 64):
+    """ a is the decision matrix, b is the criteria
+    min/max array, c is the weights matrix, v is the
+    weight of the strategy of the majority of criteria
+    ((n + 1) / (2 * n) as in vikor() if not given), and
+    block is the number of pieces checked at a time. For
+    each criterion, its weight is moved while the other
+    weights are rescaled to keep their sum. S, R and
+    their minimum and maximum are piecewise linear in
+    that weight, so between their breakpoints the first
+    change of rank is found in closed form (S, R and Q
+    are not rounded). The output is the index of the
+    alternative with the lowest Q and the (n x 2) array
+    with the lower and upper weight limits
+    """
+    w = asarray(c, dtype = float)
+    n = w.shape[0]
+    if v is None:
+        v = (n + 1) / (2 * n)
+    d = regret(a, best_worst_fij(a, b))
+    total = sum(w)
+    top = argmin(path_SRQ(d, w, 0, w[:1], v)[2][0])
+    limits = zeros((n, 2))
+    for j in range(n):
+        limits[j] = (0, total)
+        if a.shape[0] < 2:
+            continue
+        t = path_breaks(d, w, j)
+        k0 = searchsorted(t, w[j])
+
+        # upward from w_j for the upper limit and downward
+        # for the lower limit
+        for side, u in ((1, t[k0:]), (0, t[k0::-1])):
+            for k in range(0, u.shape[0] - 1, block):
+                p = u[k:k + block + 1]
+                s, r = path_SR(d, w, j, p)
+                x = first_crossing(s, r, top, v)
+                h = nonzero(~isnan(x))[0]
+                if h.shape[0] > 0:
+                    h = h[0]
+                    limits[j, side] = p[h] + x[h] \
+                        * (p[h + 1] - p[h])
+                    break
+    return top, limits
+
+if __name__ == '__main__':
+    # performances of the alternatives
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+        [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # weights of the criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # criteria max/min
+    crit_max_min = array(['max', 'max', 'max', 'max'])
+
+    # final results
+    top, limits = vikor_stability(x, crit_max_min, w)
+    print("Best alternative = ", top + 1)
+    print("Weight stability intervals = ", limits)
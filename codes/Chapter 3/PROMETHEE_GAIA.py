@@ -0,0 +1,99 @@
+# Filename: PROMETHEE_GAIA.py
+# Description: GAIA plane of the PROMETHEE method
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+from scipy.linalg import eigh
+from PROMETHEE_Session import PrometheeSession
+
+# Covariance matrix of the unicriterion net flows, read in
+# chunks of rows
+def flow_covariance(F, chunk = 100000, sample = None,
+    seed = None):
+    """ F is the (m x n) array (or numpy.memmap) with the
+    unicriterion net flows, chunk is the number of rows
+    read at a time, and sample is the number of rows
+    drawn at random (all rows if not given). The output
+    is the (n x n) covariance matrix and the column means
+    """
+    m, n = F.shape
+    rows = None
+    if sample is not None and sample < m:
+        rows = sort(random.default_rng(seed).choice(m,
+            sample, replace = False))
+        m = sample
+    s = zeros(n)
+    C = zeros((n, n))
+    for i in range(0, m, chunk):
+        if rows is None:
+            a = asarray(F[i:i + chunk], dtype = float)
+        else:
+            a = asarray(F[rows[i:i + chunk]], dtype = float)
+        s += sum(a, 0)
+        C += a.T @ a
+    mean = s / m
+    return C / m - outer(mean, mean), mean
+
+# GAIA plane: the first two principal components of the
+# unicriterion net flows
+def gaia(F, w, chunk = 100000, sample = None, seed = None):
+    """ F is the (m x n) array with the unicriterion net
+    flows (e.g., from PrometheeSession.uni_net_flows()),
+    w is the weights array, and chunk, sample and seed
+    are as in flow_covariance(). Only the two largest
+    eigenpairs of the (n x n) covariance matrix are
+    computed, so no decomposition of the (m x n) matrix
+    is needed. The output is the (m x 2) coordinates of
+    the actions, the (n x 2) axes of the criteria, the
+    decision stick, and the ratio of the information
+    retained by the plane
+    """
+    C, mean = flow_covariance(F, chunk, sample, seed)
+    n = C.shape[0]
+    k = 2 if n >= 2 else n
+    lam, V = eigh(C, subset_by_index = [n - k, n - 1])
+    lam = lam[::-1]
+    V = V[:, ::-1]
+
+    # the sign of each axis is fixed by its largest
+    # component, so the plane does not flip between runs
+    V = V * where(V[argmax(abs(V), 0), arange(k)] < 0, -1, 1)
+    if k < 2:
+        V = concatenate((V, zeros((n, 2 - k))), 1)
+        lam = concatenate((lam, zeros(2 - k)))
+    total = trace(C)
+    delta = sum(lam) / total if total > 0 else 1.0
+
+    # coordinates of the actions
+    U = empty((F.shape[0], 2))
+    for i in range(0, F.shape[0], chunk):
+        U[i:i + chunk] = (asarray(F[i:i + chunk],
+            dtype = float) - mean) @ V
+    w = asarray(w, dtype = float)
+    stick = (w / sum(abs(w))) @ V
+    return U, V, stick, delta
+
+if __name__ == '__main__':
+    # action performances array
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+        [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # preference parameters of all criteria array
+    p = array([[1, 1, 1, 1], [2, 2, 2, 2]])
+
+    # criteria min (0) or max (1) optimization array
+    c = ([1, 1, 1, 1])
+
+    # preference function array
+    d = (['li', 'li', 'li', 'li'])
+
+    # weights of criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # final results
+    F = PrometheeSession().uni_net_flows(x, p, c, d)
+    U, V, stick, delta = gaia(F, w)
+    print("Actions = ", around(U, 4))
+    print("Criteria = ", around(V, 4))
+    print("Decision stick = ", around(stick, 4))
+    print("Information retained = ", around(delta, 4))
@@ -0,0 +1,218 @@
+# Filename: PROMETHEE_I.py
+# Description: PROMETHEE I method (partial preorder)
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+from scipy.sparse import csr_matrix
+from PROMETHEE_II import promethee_flows
+
+# The partial preorder is fully defined by the positive and
+# negative flows, so it is stored as these two arrays; a
+# outranks b if plus[a] >= plus[b] and minus[a] <= minus[b]
+# (flows should be rounded, so that ties are found)
+
+# Relation of pairs of actions
+def relation(plus, minus, a, b):
+    """ plus and minus are the global positive and
+    negative flows, and a and b are arrays of actions.
+    The output is 1 if a is preferred to b, -1 if b is
+    preferred to a, 0 if they are indifferent, and 2 if
+    they are incomparable
+    """
+    ge = (plus[a] >= plus[b]) & (minus[a] <= minus[b])
+    le = (plus[a] <= plus[b]) & (minus[a] >= minus[b])
+    return where(ge & le, 0, where(ge, 1, where(le, -1, 2)))
+
+# Number of points that are weakly dominated by each point
+def weak_counts(u, v):
+    """ u and v are the coordinates of the points. The
+    output is the number of points j with u_j <= u_i and
+    v_j <= v_i (i included). The points are sorted by u
+    and the counts are found level by level as in a merge
+    sort: each point in the right half of a block counts
+    the points of the left half with lower or equal v by
+    a binary search, for all blocks at once
+    """
+    m = u.shape[0]
+    o = lexsort((v, u))
+    r = searchsorted(unique(v), v)[o]
+    k = amax(r) + 1
+    pos = arange(m)
+    out = ones(m, dtype = int)
+    h = 0
+    while (1 << h) < m:
+        # the keys sort the points by v within each block
+        keys = sort((pos >> h) * k + r)
+        right = ((pos >> h) & 1) == 1
+        left = (pos[right] >> h) - 1
+        out[right] += searchsorted(keys, left * k + r[right],
+            'right') - (left << h)
+        h += 1
+
+    # equal points count each other: all of them get the
+    # count of the last one
+    last = nonzero(concatenate(((u[o][1:] != u[o][:-1])
+        | (v[o][1:] != v[o][:-1]), [True])))[0]
+    out = out[last[searchsorted(last, pos)]]
+    res = empty(m, dtype = int)
+    res[o] = out
+    return res
+
+# Dominance sweep: how each action compares with all the
+# others, in O(m log m) time
+def dominance_counts(plus, minus):
+    """ plus and minus are the global positive and
+    negative flows. The output is the arrays with the
+    number of actions that each action is preferred to,
+    is indifferent to, is preferred by, and is
+    incomparable with; the actions that are preferred by
+    no other action are the best ones of PROMETHEE I
+    """
+    m = plus.shape[0]
+    same = unique(stack((plus, minus), 1), axis = 0,
+        return_inverse = True, return_counts = True)
+    ind = same[2][ravel(same[1])] - 1
+    better = weak_counts(plus, -minus) - 1 - ind
+    worse = weak_counts(-plus, minus) - 1 - ind
+    return better, ind, worse, m - 1 - better - ind - worse
+
+# Segment tree of the minimum of values stored by position
+class MinTree:
+    """ n is the number of positions; all the values are
+    inf at the start
+    """
+    def __init__(self, n):
+        self.size = 1
+        while self.size < n:
+            self.size *= 2
+        self.tree = [inf] * (2 * self.size)
+
+    # Set the value of a position
+    def update(self, i, x):
+        """ i is the position and x is the value """
+        t = self.tree
+        i += self.size
+        t[i] = x
+        i //= 2
+        while i > 0:
+            a = t[2 * i]
+            b = t[2 * i + 1]
+            t[i] = a if a < b else b
+            i //= 2
+
+    # First position from a given one with a value below a
+    # bound
+    def first_below(self, i, bound):
+        """ i is the first position checked and bound is
+        the bound. The output is the position (-1 if there
+        is none)
+        """
+        t = self.tree
+        if i >= self.size:
+            return -1
+        i += self.size
+        while True:
+            if t[i] < bound:
+                while i < self.size:
+                    i = 2 * i if t[2 * i] < bound else 2 * i + 1
+                return i - self.size
+
+            # go up while i is a right child, then to the
+            # next node on the right
+            while i % 2 == 1:
+                i //= 2
+            if i == 0:
+                return -1
+            i += 1
+
+# PROMETHEE I: graph of the partial preorder
+def promethee_i(plus, minus):
+    """ plus and minus are the global positive and
+    negative flows. Only the covering pairs are kept (a
+    is preferred to b and no action lies between them),
+    since the others follow by transitivity. The actions
+    are swept from the highest plus, and a segment tree
+    over the ranks of -minus keeps the lowest plus of
+    the actions swept so far; the covering actions of b
+    form a staircase (higher -minus, lower plus), and
+    each step is one search of the tree, so the time is
+    O((m + E) log m) for E covering pairs. The output is
+    the sparse (m x m) matrix with 1 for a covering
+    preference a -> b and 2 for the indifference of b
+    with the first action a of its class
+    """
+    m = plus.shape[0]
+    u = plus
+    v = -minus
+    o = lexsort((-v, -u))
+
+    # equal actions are represented by the first one in
+    # the sweep
+    rep = o.copy()
+    for k in range(1, m):
+        if u[o[k]] == u[o[k - 1]] and v[o[k]] == v[o[k - 1]]:
+            rep[k] = rep[k - 1]
+    rep[o] = rep.copy()
+    r = searchsorted(unique(v), v).tolist()
+    uu = u.tolist()
+    tree = MinTree(m)
+    at = [0] * m
+    rows = []
+    cols = []
+    vals = []
+    for b in o.tolist():
+        if rep[b] != b:
+            rows.append(rep[b])
+            cols.append(b)
+            vals.append(2)
+            continue
+
+        # the actions swept so far have higher or equal
+        # plus; the next step of the staircase has higher
+        # -minus and strictly lower plus
+        i = r[b]
+        bound = inf
+        while True:
+            i = tree.first_below(i, bound)
+            if i < 0:
+                break
+            rows.append(at[i])
+            cols.append(b)
+            vals.append(1)
+            bound = uu[at[i]]
+            i += 1
+        tree.update(r[b], uu[b])
+        at[r[b]] = b
+    return csr_matrix((array(vals, dtype = int8),
+        (array(rows, dtype = int), array(cols, dtype = int))),
+        shape = (m, m))
+
+if __name__ == '__main__':
+    # action performances array
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+        [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # preference parameters of all criteria array
+    p = array([[1, 1, 1, 1], [2, 2, 2, 2]])
+
+    # criteria min (0) or max (1) optimization array
+    c = ([1, 1, 1, 1])
+
+    # preference function array
+    d = (['li', 'li', 'li', 'li'])
+
+    # weights of criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # final results
+    plus, minus, net = promethee_flows(x, p, c, d, w)
+    print("Positive flows = ", plus)
+    print("Negative flows = ", minus)
+    better, ind, worse, inc = dominance_counts(plus, minus)
+    print("Preferred to = ", better)
+    print("Incomparable with = ", inc)
+    print("Best actions = ", nonzero(worse == 0)[0] + 1)
+    g = promethee_i(plus, minus).tocoo()
+    for a, b, t in zip(g.row, g.col, g.data):
+        print("a" + str(a + 1), "P" if t == 1 else "I",
+            "a" + str(b + 1))
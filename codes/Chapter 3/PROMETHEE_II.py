@@ -4,7 +4,8 @@
 
 import matplotlib.pyplot as plt
 from numpy import *
-from PROMETHEE_Preference_Functions import uni_cal
+from PROMETHEE_Preference_Functions import uni_cal, flows, \
+    check_params
 from PROMETHEE_Final_Rank_Figure import graph, plot
 
 # PROMETHEE method: it calls the other functions
@@ -18,21 +19,34 @@ def promethee(x, p, c, d, w):
 	'li' for linear, and 'g' for Gaussian), and w
     is the weights array
     """
-    weighted_uni_net_flows = []
-    total_net_flows = []
+    check_params(p, d)
+    weighted_uni_net_flows = empty((x.shape[1], x.shape[0]))
     for i in range(x.shape[1]):
-        weighted_uni_net_flows.append(w[i] *
-            uni_cal(x[:, i:i + 1], p[:,
-            i:i + 1], c[i], d[i]))
-	
-    # print the weighted unicriterion preference
-    # net flows
-    for i in range(size(weighted_uni_net_flows, 1)):
-        k = 0
-        for j in range(size(weighted_uni_net_flows, 0)):
-            k = k + round(weighted_uni_net_flows[j][i], 5)
-        total_net_flows.append(k)
-    return around(total_net_flows, decimals = 4)
+        weighted_uni_net_flows[i] = w[i] * uni_cal(
+            x[:, i:i + 1], p[:, i:i + 1], c[i], d[i])
+
+    # add the weighted unicriterion net flows, rounded to
+    # 5 decimals, criterion by criterion
+    return around(sum(around(weighted_uni_net_flows, 5), 0),
+        decimals = 4)
+
+# Weighted global positive, negative and net flows
+def promethee_flows(x, p, c, d, w):
+    """ x, p, c, d and w are as in promethee(). The
+    output is the arrays with the global positive,
+    negative and net flows, rounded to 4 decimals; the
+    first two are needed by PROMETHEE I
+    """
+    check_params(p, d)
+    plus = zeros(x.shape[0])
+    minus = zeros(x.shape[0])
+    for i in range(x.shape[1]):
+        pos, neg = flows(x[:, i], p[:, i], c[i], d[i])
+        plus += w[i] * pos
+        minus += w[i] * neg
+    plus = around(plus, 4)
+    minus = around(minus, 4)
+    return plus, minus, around(plus - minus, 4)
 
 # main function
 def main(a, b):
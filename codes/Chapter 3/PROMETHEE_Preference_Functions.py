@@ -5,9 +5,50 @@
 # Authors: Papathanasiou, J. & Ploskas, N.
 
 from numpy import *
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), os.pardir, 'Shared'))
+from Pairwise_Flows import BUDGET
+from Preference_Registry import PREFERENCE, check_criterion, \
+    check_params, criterion_sums
+
+# Calculate the preference degrees of a criterion
+def pref_degrees(d, p, f):
+    """ d is the array with the differences of the
+    performances, p is the array with the preference
+    parameters (q, p) of the criterion, and f is the
+    name of a preference function of the registry ('u'
+    for usual, 'us' for u-shape, 'vs' for v-shape, 'le'
+    for level, 'li' for linear, 'g' for Gaussian, or a
+    registered one). The output is the array with the
+    preference degrees
+    """
+    q, s = ravel(p)[:2]
+    return PREFERENCE[f][0](d, q, s)
+
+# Calculate the positive and negative flows of a criterion
+def flows(x, p, c, f, budget = BUDGET, workers = None):
+    """ x is the action performances array, p is the
+    array with the preference parameters, c is min (0)
+    or max (1), and f is the preference function. The
+    parameters are checked first; the sums of the
+    piecewise linear functions are found from the sorted
+    performances, and the other functions are evaluated
+    on tiles by pairwise_sums() with the memory budget
+    (in bytes) and the number of threads workers. The
+    output is the positive and negative flows
+    """
+    q, s = ravel(p)[:2]
+    check_criterion(q, s, f)
+    x = ravel(x).astype(float)
+    if c == 0:
+        x = -x
+    pos, neg = criterion_sums(x, q, s, f, budget, workers)
+    return pos / (x.shape[0] - 1), neg / (x.shape[0] - 1)
 
 # Calculate the unicriterion preference degrees
-def uni_cal(x, p, c, f):
+def uni_cal(x, p, c, f, budget = BUDGET, workers = None):
     """ x is the action performances array, p is the
     array with the preference parameters of all 
 	criteria, c is the criteria min (0) or max (1) 
@@ -15,57 +56,10 @@ def uni_cal(x, p, c, f):
 	function array for a specific criterion ('u' 
 	for usual, 'us' for u-shape, 'vs' for v-shape, 
 	'le' for level, 'li' for linear, and 'g' for 
-	Gaussian)
+	Gaussian); budget and workers are passed to
+	flows()
     """
-    uni = zeros((x.shape[0], x.shape[0]))
-    for i in range(size(uni, 0)):
-        for j in range(size(uni, 1)):
-            if i == j:
-                uni[i, j] = 0
-            elif f == 'u':  # Usual preference function
-                if x[j] - x[i] > 0:
-                    uni[i, j] = 1
-                else:
-                    uni[i, j] = 0
-            elif f == 'us': # U-shape preference function
-                if x[j] - x[i] > x[0]:
-                    uni[i, j] = 1
-                elif x[j] - x[i] <= p[0]:
-                    uni[i, j] = 0
-            elif f == 'vs': # V-shape preference function
-                if x[j] - x[i] > p[1]:
-                    uni[i, j] = 1
-                elif x[j] - x[i] <= 0:
-                    uni[i, j] = 0
-                else:
-                    uni[i, j] = (x[j] - x[i]) / p[1]
-            elif f == 'le': # Level preference function
-                if x[j] - x[i] > p[1]:
-                    uni[i, j] = 1
-                elif x[j] - x[i] <= p[0]:
-                    uni[i, j] = 0
-                else:
-                    uni[i, j] = 0.5
-            elif f == 'li': # Linear preference function
-                if x[j] - x[i] > p[1]:
-                    uni[i, j] = 1
-                elif x[j] - x[i] <= p[0]:
-                    uni[i, j] = 0
-                else:
-                    uni[i, j] = ((x[j] - x[i]) -
-                        p[0]) / (p[1] - p[0])
-            elif f == 'g':  # Gaussian preference function
-                if x[j] - x[i] > 0:
-                    uni[i, j] = 1 - math.exp(-(math.pow(x[j]
-                        - x[i], 2) / (2 * p[1] ** 2)))
-                else:
-                    uni[i, j] = 0
-    if c == 0:
-        uni = uni
-    elif c == 1:
-        uni = uni.T
     # positive, negative and net flows
-    pos_flows = sum(uni, 1) / (uni.shape[0] - 1)
-    neg_flows = sum(uni, 0) / (uni.shape[0] - 1)
+    pos_flows, neg_flows = flows(x, p, c, f, budget, workers)
     net_flows = pos_flows - neg_flows
-    return net_flows
\ No newline at end of file
+    return net_flows
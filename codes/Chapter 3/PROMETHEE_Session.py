@@ -0,0 +1,139 @@
+# Filename: PROMETHEE_Session.py
+# Description: PROMETHEE II method with a cache of the
+# unicriterion flows, so that only the aggregation is
+# repeated when the weights change
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+from collections import OrderedDict
+import hashlib
+import timeit
+from PROMETHEE_Preference_Functions import BUDGET, flows, \
+    check_params
+from PROMETHEE_II import promethee
+
+# PROMETHEE session: keeps the unicriterion flows of the
+# criteria that were already evaluated
+class PrometheeSession:
+    """ capacity is the number of criteria whose flows are
+    kept (the least recently used ones are evicted), and
+    budget and workers are passed to flows()
+    """
+    def __init__(self, capacity = 256, budget = BUDGET,
+        workers = None):
+        self.capacity = capacity
+        self.budget = budget
+        self.workers = workers
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # Key of a criterion
+    def key(self, x, p, c, f):
+        """ x is the column of the action performances, p
+        is the array with its preference parameters, c is
+        min (0) or max (1), and f is the preference
+        function
+        """
+        h = hashlib.blake2b(digest_size = 16)
+        h.update(ascontiguousarray(x, dtype = float).tobytes())
+        h.update(ascontiguousarray(ravel(p)[:2],
+            dtype = float).tobytes())
+        h.update(repr((int(c), str(f))).encode())
+        return h.digest()
+
+    # Positive and negative flows of a criterion
+    def criterion(self, x, p, c, f):
+        """ the arguments are as in key(). The output is
+        the (2 x m) array with the positive and negative
+        flows
+        """
+        k = self.key(x, p, c, f)
+        if k in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(k)
+            return self.cache[k]
+        self.misses += 1
+        v = array(flows(x, p, c, f, self.budget, self.workers))
+        self.cache[k] = v
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last = False)
+        return v
+
+    # Unicriterion net flows of all criteria
+    def uni_net_flows(self, x, p, c, d):
+        """ x is the action performances array, p is the
+        array with the preference parameters of all
+        criteria, c is the criteria min (0) or max (1)
+        optimization array, and d is the preference
+        function array. The output is the (m x n) array
+        with the unicriterion net flows
+        """
+        check_params(p, d)
+        F = empty(x.shape, dtype = float)
+        for i in range(x.shape[1]):
+            v = self.criterion(x[:, i], p[:, i], c[i], d[i])
+            subtract(v[0], v[1], out = F[:, i])
+        return F
+
+    # PROMETHEE II net flows for one or more weight vectors
+    def promethee(self, x, p, c, d, w):
+        """ x, p, c and d are as in uni_net_flows(), and w
+        is the weights array or a (k x n) array with one
+        weight vector per row. Only the criteria that are
+        not in the cache are evaluated, and the net flows
+        are aggregated with one matrix product (the terms
+        are not rounded as in promethee()). The output is
+        the array with the global net flows (k x m for
+        many weight vectors)
+        """
+        return asarray(w, dtype = float) @ \
+            self.uni_net_flows(x, p, c, d).T
+
+    # Global positive and negative flows
+    def global_flows(self, x, p, c, d, w):
+        """ the arguments are as in promethee(). The output
+        is the arrays with the global positive and
+        negative flows (k x m for many weight vectors)
+        """
+        check_params(p, d)
+        w = asarray(w, dtype = float)
+        v = [self.criterion(x[:, i], p[:, i], c[i], d[i])
+            for i in range(x.shape[1])]
+        plus = w @ array([a[0] for a in v])
+        minus = w @ array([a[1] for a in v])
+        return plus, minus
+
+if __name__ == '__main__':
+    # action performances array
+    x = array([[8, 7, 2, 1], [5, 3, 7, 5], [7, 5, 6, 4],
+        [9, 9, 7, 3], [11, 10, 3, 7], [6, 9, 5, 4]])
+
+    # preference parameters of all criteria array
+    p = array([[1, 1, 1, 1], [2, 2, 2, 2]])
+
+    # criteria min (0) or max (1) optimization array
+    c = ([1, 1, 1, 1])
+
+    # preference function array
+    d = (['li', 'li', 'li', 'li'])
+
+    # weights of criteria
+    w = array([0.4, 0.3, 0.1, 0.2])
+
+    # final results
+    s = PrometheeSession()
+    print("Global preference flows = ",
+        around(s.promethee(x, p, c, d, w), 4))
+    print("promethee() = ", promethee(x, p, c, d, w))
+
+    # re-weighting only repeats the aggregation
+    random.seed(1)
+    ws = random.dirichlet(ones(x.shape[1]), 10000)
+    start = timeit.default_timer()
+    phi = s.promethee(x, p, c, d, ws)
+    stop = timeit.default_timer()
+    print("time = ", stop - start)
+    print("Times ranked first = ", bincount(argmax(phi, 1),
+        minlength = x.shape[0]))
+    print("Cache hits and misses = ", s.hits, s.misses)
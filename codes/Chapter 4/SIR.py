@@ -5,110 +5,122 @@
 from numpy import *
 import matplotlib.pyplot as plt
 from SIR_Final_Rank_Figure import graph, plot
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(
+    __file__)), os.pardir, 'Shared'))
+from Pairwise_Flows import BUDGET
+from Preference_Registry import PREFERENCE, check_params, \
+    criterion_sums
 
 # Calculate the preference degrees
 def pref_func(a, b, c, d, e, m):
     """ a and b are action performances, c is q, d is p,
     e is the preference function ('u' for usual, 'us'
     for u-shape, 'vs' for v-shape, 'le' for level,
-    'li' for linear, and 'g' for Gaussian), m is min/max
+    'li' for linear, 'g' for Gaussian, or a function
+    of the registry), m is min/max
     """
-    f = float(1.0)
     if m == 1:
         temp = a
         a = b
         b = temp
-    if e == 'u': # Usual preference function
-        if b - a > 0:
-            f = 1
-        else:
-            f = 0
-    elif e == 'us': # U-shape preference function
-        if b - a > c:
-            f = 1
-        elif b - a <= c:
-            f = 0
-    elif e == 'vs': # V-shape preference function
-        if b - a > d:
-            f = 1
-        elif b - a <= 0:
-            f = 0
-        else:
-            f = (b - a) / d
-    elif e == 'le': # Level preference function
-        if b - a > d:
-            f = 1
-        elif b - a <= c:
-            f = 0
-        else:
-            f = 0.5
-    elif e == 'li': # Linear preference function
-        if b - a > d:
-            f = 1
-        elif b - a <= c:
-            f = 0
-        else:
-            f = ((b - a) - c) / (d - c)
-    elif e == 'g': # Gaussian preference function
-        if b - a > 0:
-            f = 1 - math.exp(-(math.pow(b - a, 2)
-                / (2 * d ** 2)))
-        else:
-            f = 0
-    return f
+    return float(PREFERENCE[e][0](asarray(b - a,
+        dtype = float), c, d))
+
+# Calculate S and I matrices together: the I matrix of the
+# criteria directions c is the S matrix of the opposite
+# directions, i.e., the column sums of the same pairwise
+# preference degrees whose row sums give S
+def SImatrices(x, p, c, d, budget = BUDGET, workers = None):
+    """ x is the action performances array, p is the
+    array with the preference parameters of all criteria,
+    c is the criteria min (0) or max (1) optimization
+    array, d is the preference function array, and
+    budget and workers are passed to pairwise_sums(). The
+    parameters of all criteria are checked first; the
+    sums of the piecewise linear preference functions are
+    found from the sorted performances in O(m log m) time
+    by sorted_sums(), and the other functions are
+    evaluated pairwise. The output is the S and I
+    matrices
+    """
+    check_params(p, d)
+    S = zeros((size(x, 0), size(x, 1)))
+    I = zeros((size(x, 0), size(x, 1)))
+    for i in range(size(x, 1)):
+        y = x[:, i].astype(float)
+        if c[i] == 0:
+            y = -y
+        S[:, i], I[:, i] = criterion_sums(y, p[0, i], p[1, i],
+            d[i], budget, workers)
+    return S, I
+
+# Calculate S and I matrices pair by pair, with the
+# preference degrees of pref_func()
+def SIpairwise(x, p, c, d):
+    """ the arguments are as in SImatrices(); this takes
+    O(m^2) time per criterion and is used to check the
+    sums of SImatrices()
+    """
+    S = zeros((size(x, 0), size(x, 1)))
+    I = zeros((size(x, 0), size(x, 1)))
+    for i in range(size(x, 1)):
+        for j in range(size(x, 0)):
+            for k in range(size(x, 0)):
+                S[j, i] += pref_func(x[j, i], x[k, i],
+                    p[0, i], p[1, i], d[i], c[i])
+                I[j, i] += pref_func(x[k, i], x[j, i],
+                    p[0, i], p[1, i], d[i], c[i])
+    return S, I
 
-# Calculate S and I matrices
-def SImatrix(x, p, c, d):
+# Calculate S or I matrix
+def SImatrix(x, p, c, d, budget = BUDGET, workers = None):
     """ x is the action performances array, p is the
     array with the preference parameters of all criteria,
     c is the criteria min (0) or max (1) optimization
     array, and d is the preference function array for
     a specific criterion ('u' for usual, 'us' for u-shape,
     'vs' for v-shape, 'le' for level, 'li' for linear,
-    and 'g' for Gaussian)
+    'g' for Gaussian, or a function of the registry), and
+    budget and workers are as in SImatrices()
     """
-    SI = zeros((size(x, 0), size(x, 1)))
-    for i in range(size(x, 1)):
-        for j in range(size(x, 0)):
-            k = 0
-            for h in range(size(x, 0)):
-                k = k + pref_func(x[j, i], x[h, i],
-                    p[0, i], p[1, i], d[i], c[i])
-                SI[j, i] = k
-    return SI
+    return SImatrices(x, p, c, d, budget, workers)[0]
 
 # Calculate S- and I-flow for SIR-SAW
 def SIflowsSAW(w, SI):
-    """ w is the weights array and SI is S or I matrix
+    """ w is the weights array (or a (k x n) array with
+    one weight vector per row) and SI is S or I matrix
+    """
+    return asarray(w, dtype = float) @ SI.T
+
+# Weighted Lp distances of the rows of a matrix of
+# differences
+def lp_distance(w, D, l):
+    """ w is the weights array (or a (k x n) array of
+    them), D is the (m x n) array with the absolute
+    differences, and l is the distance metric (inf for
+    the Chebyshev distance). Since (w * d)^l = w^l * d^l,
+    the sums for all weight vectors are one matrix
+    product
     """
-    k = zeros(size(SI, 0))
-    for i in range(size(SI, 0)):
-        for j in range(size(SI, 1)):
-            k[i] = k[i] + w[j] * SI[i, j]
-    return k
+    w = asarray(w, dtype = float)
+    if isinf(l):
+        out = zeros(w.shape[:-1] + (D.shape[0],))
+        for j in range(D.shape[1]):
+            maximum(out, multiply.outer(abs(w[..., j]),
+                D[:, j]), out = out)
+        return out
+    return ((w**l) @ (D**l).T)**(1 / l)
 
 # Calculate SIplus and SIminus for SIR-TOPSIS
 def SIRTOPSIS(w, SI, l):
-    """ w is the weights array, SI is S or I matrix,
+    """ w is the weights array (or a (k x n) array with
+    one weight vector per row), SI is S or I matrix,
     and l is the distance metric
     """
-    SIplus = zeros((size(SI, 0)))
-    SIminus = zeros((size(SI, 0)))
-    bb = []
-    cc = []
-    for i in range((size(w, 0))):
-        bb.append(amax(SI[:, i:i + 1]))
-        bbb = array(bb)
-        cc.append(amin(SI[:, i:i + 1]))
-        ccc = array(cc)
-    for i in range((size(SI, 0))):
-        for j in range((size(SI, 1))):
-            SIplus[i] = SIplus[i] + math.pow(w[j]
-                * abs(SI[i, j] - bbb[j]), l)
-            SIminus[i] = SIminus[i] + math.pow(w[j]
-                * abs(SI[i, j] - ccc[j]), l)
-        SIplus[i] = math.pow(SIplus[i], 1 / l)
-        SIminus[i] = math.pow(SIminus[i], 1 / l)
+    SIplus = lp_distance(w, abs(SI - amax(SI, 0)), l)
+    SIminus = lp_distance(w, abs(SI - amin(SI, 0)), l)
     return SIplus, SIminus
 
 # Calculate the S- and I-flow for SIR-TOPSIS
@@ -129,6 +141,32 @@ def Rflow(s, i):
     """
     return s / (s + i)
 
+# S-, I-, n- and r-flows for many weight vectors and
+# aggregation procedures at once
+def sir_flows(S, I, w, l):
+    """ S and I are the S and I matrices, w is the weights
+    array or a (k x n) array with one weight vector per
+    row, and l is the list of aggregation procedures:
+    'saw' for SIR-SAW or the distance metric of
+    SIR-TOPSIS (inf for the Chebyshev distance). The
+    output is the (k x len(l) x m) arrays with the S-,
+    I-, n- and r-flows
+    """
+    w = atleast_2d(asarray(w, dtype = float))
+    out = empty((4, w.shape[0], len(l), S.shape[0]))
+    for t in range(len(l)):
+        if isinstance(l[t], str) and l[t] == 'saw':
+            Sflow = SIflowsSAW(w, S)
+            Iflow = SIflowsSAW(w, I)
+        else:
+            Sflow = SIflowsTOPSIS(*SIRTOPSIS(w, S, l[t]))
+            Iflow = SIflowsTOPSIS(*SIRTOPSIS(w, I, l[t]))
+        out[0, :, t] = Sflow
+        out[1, :, t] = Iflow
+        out[2, :, t] = Nflow(Sflow, Iflow)
+        out[3, :, t] = Rflow(Sflow, Iflow)
+    return out[0], out[1], out[2], out[3]
+
 # main function
 def main(a, b, c):
     """ a, b, and c are flags; if a and b are set to 
@@ -146,27 +184,28 @@ def main(a, b, c):
     p = array([[1, 1, 1, 1], [2, 2, 2, 2]])
 
     # criteria min (0) or max (1) optimization array for
-    # calculating S matrix
+    # calculating S matrix (the I matrix uses the opposite)
     c1 = ([1, 1, 1, 1])
 
-    # criteria min (0) or max (1) optimization array for
-    # calculating I matrix (the opposite of c1)
-    c2 = ([0, 0, 0, 0])
-
     # preference function array
     d = (['li', 'li', 'li', 'li'])
 
     # weights of criteria
     w = array([0.4, 0.3, 0.1, 0.2])
 
-    # calculate S matrix
-    S = SImatrix(x, p, c1, d)
+    # calculate S and I matrices
+    S, I = SImatrices(x, p, c1, d)
     print("S = ", S)
-
-    # calculate I matrix
-    I = SImatrix(x, p, c2, d)
     print("I = ", I)
 
+    # with decimal data, differences that fall on the
+    # thresholds are rounded as in the pairwise degrees
+    y = array([[0.4, 0.7], [0.3, 0.5], [0.1, 0.2], [0.6, 0.4]])
+    q = array([[0.1, 0.1], [0.3, 0.2]])
+    print("Same as pairwise = ", allclose(SImatrices(y, q,
+        [1, 0], ['us', 'li']), SIpairwise(y, q, [1, 0],
+        ['us', 'li'])))
+
     if c == 1: # SIR-SAW
         # calculate S-flow
         Sflow = SIflowsSAW(w, S)
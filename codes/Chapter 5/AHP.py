@@ -3,8 +3,8 @@
 # Authors: Papathanasiou, J. & Ploskas, N.
 
 from numpy import *
-import scipy.sparse.linalg as sc
 import matplotlib.pyplot as plt
+import warnings
 from AHP_Final_Rank_Figure import graph, plot
 
 # normalized column sum method
@@ -30,6 +30,42 @@ def geomean(x):
         z[i] = pow(z[i], (1 / x.shape[0]))
     return z
 
+# power iteration method for a stack of pairwise comparison
+# matrices
+def power_eig(x, tol = 1e-12, max_iter = 1000):
+    """ x is a pairwise comparison matrix or a (k x m x m)
+    stack of them, tol is the tolerance on the change of
+    the priority vectors, and max_iter is the maximum
+    number of iterations. All matrices are multiplied at
+    once, and the ones that have converged are dropped
+    from the next iterations; a RuntimeWarning is issued
+    for the matrices that have not converged after
+    max_iter iterations. The output is the principal
+    eigenvalues and the priority vectors (the principal
+    eigenvectors normalized to sum 1)
+    """
+    x = asarray(x, dtype = float)
+    a = x.reshape((-1,) + x.shape[-2:])
+    k, m = a.shape[0], a.shape[1]
+    w = full((k, m), 1 / m)
+    lam = zeros(k)
+    active = arange(k)
+    steps = 0
+    while active.shape[0] > 0 and steps < max_iter:
+        y = einsum('kij,kj->ki', a[active], w[active])
+        t = sum(y, 1)
+        y = y / t[:, newaxis]
+        lam[active] = t
+        done = amax(abs(y - w[active]), 1) < tol
+        w[active] = y
+        active = active[~done]
+        steps += 1
+    if active.shape[0] > 0:
+        warnings.warn(str(active.shape[0]) + ' of ' + str(k)
+            + ' matrices did not converge in '
+            + str(max_iter) + ' iterations', RuntimeWarning)
+    return lam.reshape(x.shape[:-2]), w.reshape(x.shape[:-1])
+
 # AHP method: it calls the other functions
 def ahp(PCM, PCcriteria, m, n, c):
     """ PCM is the pairwise comparison matrix for the
@@ -42,10 +78,7 @@ def ahp(PCM, PCcriteria, m, n, c):
     """
     # calculate the priority vector of criteria
     if c == 1: # eigenvector
-        val, vec = sc.eigs(PCcriteria, k = 1, which = 'LM')
-        eigcriteria = real(vec)
-        w = eigcriteria / sum(eigcriteria)
-        w = array(w).ravel()
+        val, w = power_eig(PCcriteria)
     elif c == 2: # normalized column sum
         normPCcriteria = norm(PCcriteria)
         w = array(sum(normPCcriteria, 1) / n)
@@ -54,21 +87,18 @@ def ahp(PCM, PCcriteria, m, n, c):
         w = GMcriteria / sum(GMcriteria)
     # calculate the local priority vectors for the 
 	# alternatives
-    S = []
-    for i in range(n):
-        if c == 1: # eigenvector
-            val, vec = sc.eigs(PCM[i * m:i * m + m, 0:m],
-                k = 1, which = 'LM')
-            eigalter = real(vec)
-            s = eigalter / sum(eigalter)
-            s = array(s).ravel()
-        elif c == 2: # normalized column sum
-            normPCM = norm(PCM[i*m:i*m+m,0:m])
-            s = array(sum(normPCM, 1) / m)
-        else: # geometric mean
-            GMalternatives = geomean(PCM[i*m:i*m+m,0:m])
-            s = GMalternatives / sum(GMalternatives)
-        S.append(s)
+    if c == 1: # eigenvector (all the criteria in one call)
+        val, S = power_eig(PCM[0:n * m, 0:m].reshape(n, m, m))
+    else:
+        S = []
+        for i in range(n):
+            if c == 2: # normalized column sum
+                normPCM = norm(PCM[i*m:i*m+m,0:m])
+                s = array(sum(normPCM, 1) / m)
+            else: # geometric mean
+                GMalternatives = geomean(PCM[i*m:i*m+m,0:m])
+                s = GMalternatives / sum(GMalternatives)
+            S.append(s)
     S = transpose(S)
 
     # calculate the global priority vector for the
@@ -0,0 +1,125 @@
+# Filename: FuzzyNumbers.py
+# Description: Arithmetic of triangular and trapezoidal
+# fuzzy numbers stored in arrays, and encoding of the
+# linguistic variables into tables of fuzzy numbers
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+
+# A triangular fuzzy number (a1, a2, a3) or a trapezoidal
+# fuzzy number (a1, a2, a3, a4) is stored on the last axis
+# of an array, so that a matrix of fuzzy numbers is an
+# array of shape (..., 3) or (..., 4)
+
+# Create an array of fuzzy numbers
+def f_array(a):
+    """ a is a fuzzy number, a list of fuzzy numbers or an
+    array of them. The output is a contiguous float
+    array with the vertices on the last axis
+    """
+    a = ascontiguousarray(a, dtype = float)
+    if a.shape[-1] not in (3, 4):
+        raise ValueError('fuzzy numbers need 3 or 4 vertices')
+    return a
+
+# Addition of fuzzy numbers
+def f_add(a, b):
+    """ a and b are arrays of fuzzy numbers of the same
+    type. The output is their sum
+    """
+    return add(a, b)
+
+# Subtraction of fuzzy numbers
+def f_sub(a, b):
+    """ a and b are arrays of fuzzy numbers of the same
+    type. The output is their difference
+    """
+    return subtract(a, b[..., ::-1])
+
+# Multiplication of fuzzy numbers by positive fuzzy numbers
+def f_mul(a, b):
+    """ a is an array of fuzzy numbers and b is an array
+    of positive fuzzy numbers of the same type. The
+    output is their (approximate) product; a negative
+    vertex of a is multiplied by the opposite vertex of
+    b, so that the vertices stay in order
+    """
+    return where(a >= 0, multiply(a, b), multiply(a, b[..., ::-1]))
+
+# Multiplication of fuzzy numbers by crisp numbers
+def f_scale(a, k):
+    """ a is an array of fuzzy numbers and k is a crisp
+    number (or an array of them, one per fuzzy number).
+    The output is the scaled fuzzy numbers; a negative
+    k reverses the order of the vertices
+    """
+    k = asarray(k, dtype = float)[..., newaxis]
+    return where(k < 0, (a * k)[..., ::-1], a * k)
+
+# Division of fuzzy numbers by positive crisp numbers
+def f_div(a, k):
+    """ a is an array of fuzzy numbers and k is a positive
+    crisp number (or an array of them, one per fuzzy
+    number). The output is the divided fuzzy numbers
+    """
+    return a / asarray(k, dtype = float)[..., newaxis]
+
+# Vertex distance of fuzzy numbers
+def f_distance(a, b):
+    """ a and b are arrays of fuzzy numbers of the same
+    type. The output is the array with their vertex
+    distances
+    """
+    return sqrt(1 / a.shape[-1] * sum((a - b)**2, -1))
+
+# Alpha-cut of fuzzy numbers
+def f_alpha_cut(a, alpha):
+    """ a is an array of fuzzy numbers and alpha is the
+    level of the cut (0 to 1). The output is the array
+    with the lower and upper bounds of the intervals on
+    the last axis
+    """
+    lo = a[..., 0] + alpha * (a[..., 1] - a[..., 0])
+    hi = a[..., -1] - alpha * (a[..., -1] - a[..., -2])
+    return stack((lo, hi), -1)
+
+# Defuzzification (centroid) of fuzzy numbers
+def f_defuzz(a):
+    """ a is an array of fuzzy numbers. The output is the
+    array with the crisp values (the x coordinate of
+    the centroid)
+    """
+    if a.shape[-1] == 3:
+        return sum(a, -1) / 3
+    a0, a1, a2, a3 = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    return (-a0 * a1 + a2 * a3 +
+        1 / 3 * (a3 - a2)**2 -
+        1 / 3 * (a1 - a0)**2) \
+        / (-a0 - a1 + a2 + a3)
+
+# Compile the linguistic variables into a numeric table
+def scale_table(a):
+    """ a is the dictionary with the linguistic variables.
+    The output is the sorted array with the terms and
+    the array with their fuzzy numbers (one row per
+    term)
+    """
+    terms = array(sorted(a))
+    return terms, array([a[t] for t in terms], dtype = float)
+
+# Encode the linguistic variables of a matrix as integer
+# codes
+def encode(a, b):
+    """ a is the dictionary with the linguistic variables
+    and b is the matrix with the criteria weights (or
+    the ratings). The output is the array with the row of
+    each term in the table of scale_table(), of the
+    smallest unsigned integer type that holds all the
+    rows (uint8 for up to 256 terms)
+    """
+    terms = scale_table(a)[0]
+    b = asarray(b)
+    codes = minimum(searchsorted(terms, b), len(terms) - 1)
+    if (terms[codes] != b).any():
+        raise KeyError(str(b[terms[codes] != b][0]))
+    return codes.astype(min_scalar_type(len(terms) - 1))
@@ -0,0 +1,143 @@
+# Filename: Pairwise_Flows.py
+# Description: Row and column sums of pairwise preference
+# degrees computed on tiles by a pool of threads
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+# Memory (in bytes) used by the tiles at a time
+BUDGET = 2**28
+
+# Side of the square tiles for a memory budget: a tile and
+# the temporary arrays of the preference function take
+# about five (block x block) float arrays per thread
+def tile_size(m, budget, workers):
+    """ m is the number of actions, budget is the memory
+    in bytes and workers is the number of threads
+    """
+    block = int(sqrt(budget / (40 * workers)))
+    if block > m:
+        block = m
+    if block < 1:
+        block = 1
+    return block
+
+# Row and column sums of the tiles of one band of rows
+def band_sums(x, kernel, bands, block, pos):
+    """ x is the performances array, kernel is the
+    preference function, bands is the list with the first
+    row of each band, block is the side of the tiles,
+    and pos is the array where the row sums are written.
+    The output is the column sums of the bands
+    """
+    neg = zeros(x.shape[0])
+    for i in bands:
+        a = x[i:i + block, newaxis]
+        for j in range(0, x.shape[0], block):
+            uni = kernel(a - x[j:j + block])
+            pos[i:i + block] += sum(uni, 1)
+            neg[j:j + block] += sum(uni, 0)
+    return neg
+
+# Row and column sums of the pairwise preference degrees
+def pairwise_sums(x, kernel, budget = BUDGET, workers = None):
+    """ x is the performances array (higher is better),
+    kernel is a function that returns the preference
+    degrees of an array of differences, budget is the
+    memory in bytes for the tiles, and workers is the
+    number of threads (the number of cores if not given).
+    The (m x m) matrix with P(x_i - x_j) is evaluated on
+    tiles, and the bands of rows are shared between the
+    threads, since numpy releases the GIL. The output is
+    the row sums (what each action is preferred over the
+    others) and the column sums (what the others are
+    preferred over each action)
+    """
+    x = ravel(x).astype(float)
+    m = x.shape[0]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    block = tile_size(m, budget, workers)
+    starts = list(range(0, m, block))
+    if workers > len(starts):
+        workers = len(starts)
+    pos = zeros(m)
+
+    # the bands are dealt to the threads in a fixed order,
+    # so the sums do not depend on the timing
+    if workers <= 1:
+        return pos, band_sums(x, kernel, starts, block, pos)
+    with ThreadPoolExecutor(workers) as pool:
+        parts = [pool.submit(band_sums, x, kernel,
+            starts[k::workers], block, pos)
+            for k in range(workers)]
+        neg = zeros(m)
+        for part in parts:
+            neg += part.result()
+    return pos, neg
+
+# Number of sorted values y_j with x_i - y_j above a
+# threshold
+def count_above(x, y, t, strict = True):
+    """ x is the performances array, y is the sorted
+    performances, t is the threshold, and strict is True
+    for x_i - y_j > t and False for x_i - y_j >= t. The
+    values that pass are a prefix of y; its end is found
+    by binary search on y_j < x_i - t and then moved over
+    the equal values of y while the rounded differences
+    x_i - y_j disagree, so the counts agree with the
+    pairwise differences at the thresholds. The output is
+    the array with the length of the prefix of each x_i
+    """
+    m = y.shape[0]
+    k = searchsorted(y, x - t, 'left' if strict else 'right')
+
+    # the differences of the values around x_i - t are
+    # rounded, so the end may be off by a few values
+    while True:
+        i = nonzero(k < m)[0]
+        d = x[i] - y[k[i]]
+        i = i[(d > t) if strict else (d >= t)]
+        if i.shape[0] == 0:
+            break
+        k[i] = searchsorted(y, y[k[i]], 'right')
+    while True:
+        i = nonzero(k > 0)[0]
+        d = x[i] - y[k[i] - 1]
+        i = i[~((d > t) if strict else (d >= t))]
+        if i.shape[0] == 0:
+            break
+        k[i] = searchsorted(y, y[k[i] - 1], 'left')
+    return k
+
+# Row and column sums of the pairwise preference degrees
+# from the sorted performances, for preference functions
+# that are piecewise linear: P(d) is 0 for d <= q, 1 for
+# d > p and a + b * d in between
+def sorted_sums(x, pieces):
+    """ x is the performances array (higher is better)
+    and pieces is the tuple (q, p, a, b). The output is
+    the same as the output of pairwise_sums(), in
+    O(m log m) time: the actions are sorted once, the
+    thresholds are found by binary search and the linear
+    parts are summed with prefix sums
+    """
+    q, s, a, b = pieces
+    y = sort(x)
+    c = concatenate(([0], cumsum(y - y[0]))) # prefix sums
+    m = x.shape[0]
+
+    # x_i - y_j > p, and q < x_i - y_j <= p
+    lo = count_above(x, y, s)
+    hi = count_above(x, y, q)
+    pos = lo + (hi - lo) * (a + b * (x - y[0])) \
+        - b * (c[hi] - c[lo])
+
+    # y_j - x_i > p, and q < y_j - x_i <= p
+    lo = count_above(x, y, -q, False)
+    hi = count_above(x, y, -s, False)
+    neg = (m - hi) + (hi - lo) * (a - b * (x - y[0])) \
+        + b * (c[hi] - c[lo])
+    return pos, neg
@@ -0,0 +1,121 @@
+# Filename: Preference_Registry.py
+# Description: Registry of the preference functions used
+# by the PROMETHEE and SIR methods
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+from Pairwise_Flows import BUDGET, pairwise_sums, sorted_sums
+
+# Preference functions by name: each entry holds a function
+# that returns the preference degrees of an array of
+# differences d for the thresholds q and p, a function that
+# returns the tuple (q, p, a, b) of sorted_sums() if the
+# preference function is piecewise linear (None otherwise),
+# and a function that checks q and p
+PREFERENCE = {}
+
+# Add a preference function to the registry
+def register(name, degrees, pieces = None, check = None):
+    """ name is the name used in the preference function
+    arrays, degrees is a function (d, q, p) that returns
+    the preference degrees of an array of differences,
+    pieces is a function (q, p) that returns the tuple
+    (q, p, a, b) if the function is 0 for d <= q, 1 for
+    d > p and a + b * d in between, and check is a
+    function (q, p) that returns an error message for
+    invalid thresholds (None if they are valid)
+    """
+    PREFERENCE[name] = (degrees, pieces, check)
+
+# Check the preference function and the thresholds of a
+# criterion
+def check_criterion(q, p, f):
+    """ q and p are the thresholds and f is the name of
+    the preference function
+    """
+    if f not in PREFERENCE:
+        raise ValueError('unknown preference function '
+            + repr(f))
+    if not (isfinite(q) and isfinite(p)):
+        raise ValueError('thresholds must be finite')
+    check = PREFERENCE[f][2]
+    if check is not None:
+        msg = check(q, p)
+        if msg is not None:
+            raise ValueError(msg)
+
+# Check the preference functions and the thresholds of all
+# criteria before any flows are computed
+def check_params(p, f):
+    """ p is the (2 x n) array with the thresholds q and
+    p of all criteria and f is the preference function
+    array
+    """
+    for i in range(len(f)):
+        try:
+            check_criterion(p[0][i], p[1][i], f[i])
+        except ValueError as e:
+            raise ValueError('criterion ' + str(i + 1) + ': '
+                + str(e))
+
+# Row and column sums of the preference degrees of a
+# criterion
+def criterion_sums(x, q, p, f, budget = BUDGET,
+    workers = None):
+    """ x is the performances array (higher is better), q
+    and p are the thresholds, f is the name of the
+    preference function, and budget and workers are
+    passed to pairwise_sums(). The sums of the piecewise
+    linear functions are found from the sorted
+    performances; the others are evaluated pairwise. The
+    output is the same as the output of pairwise_sums()
+    """
+    degrees, pieces, check = PREFERENCE[f]
+    if pieces is not None:
+        return sorted_sums(x, pieces(q, p))
+    return pairwise_sums(x, lambda d: degrees(d, q, p),
+        budget, workers)
+
+# Usual preference function
+def usual(d, q, p):
+    return where(d > 0, 1.0, 0.0)
+
+# U-shape preference function
+def u_shape(d, q, p):
+    return where(d > q, 1.0, 0.0)
+
+# V-shape preference function
+def v_shape(d, q, p):
+    return where(d > p, 1.0, where(d <= 0, 0.0, d / p))
+
+# Level preference function
+def level(d, q, p):
+    return where(d > p, 1.0, where(d <= q, 0.0, 0.5))
+
+# Linear preference function
+def linear(d, q, p):
+    return where(d > p, 1.0, where(d <= q, 0.0,
+        (d - q) / (p - q)))
+
+# Gaussian preference function
+def gaussian(d, q, p):
+    return where(d > 0, 1 - exp(-(d**2 / (2 * p**2))), 0.0)
+
+# Check of the indifference threshold: a negative q would
+# count the pair of an action with itself (P(0) > 0)
+def check_q(q, p):
+    return None if q >= 0 else 'q must not be negative'
+
+register('u', usual, lambda q, p: (0, 0, 0, 0))
+register('us', u_shape, lambda q, p: (q, q, 0, 0), check_q)
+register('vs', v_shape, lambda q, p: (0, p, 0, 1 / p),
+    lambda q, p: None if p > 0 else 'p must be positive')
+register('le', level, lambda q, p: (q, p, 0.5, 0),
+    lambda q, p: check_q(q, p) or (None if q <= p else
+    'q must not exceed p'))
+register('li', linear, lambda q, p: (q, p, -q / (p - q),
+    1 / (p - q)),
+    lambda q, p: check_q(q, p) or (None if q < p else
+    'q must be less than p'))
+register('g', gaussian, None,
+    lambda q, p: None if p > 0 else 'p must be positive')
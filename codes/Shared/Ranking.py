@@ -0,0 +1,23 @@
+# Filename: Ranking.py
+# Description: Selection of the best alternatives, shared
+# by the methods of all chapters
+# Authors: Papathanasiou, J. & Ploskas, N.
+
+from numpy import *
+
+# Select the k best alternatives without sorting all of them
+def best_k(x, k, largest = True):
+    """ x is the array with the scores, k is the number
+    of the alternatives kept, and largest is True if
+    higher scores are better (e.g., TOPSIS) and False if
+    lower scores are better (e.g., VIKOR). The output is
+    the indices of the k best alternatives in rank order
+    and their scores
+    """
+    y = -x if largest else x
+    if k < x.shape[0]:
+        i = argpartition(y, k - 1)[:k]
+    else:
+        i = arange(x.shape[0])
+    i = i[argsort(y[i], kind = 'stable')]
+    return i, x[i]